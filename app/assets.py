@@ -1,8 +1,26 @@
 import customtkinter
 from PIL import Image, ImageDraw
 import os
-import requests
-from io import BytesIO
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# How many ready-made avatar images to keep in memory, most recently shown first.
+AVATAR_MEMORY_ENTRIES = 64
+# Threads shared by all background image loading; more loads than this wait their turn.
+IMAGE_WORKERS = 2
+
+ICONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'icons')
+# Icon attributes and their files. Each is only decoded the first time something uses it.
+ICON_FILES = {
+    'backup_icon': 'backup.png',
+    'briefing_icon': 'briefing.png',
+    'delete_icon': 'delete.png',
+    'new_icon': 'new.png',
+    'restore_icon': 'restore.png',
+    'search_icon': 'search.png',
+    'update_icon': 'update.png',
+}
 
 class AppAssets:
     def __init__(self):
@@ -14,21 +32,24 @@ class AppAssets:
         self.font_button = customtkinter.CTkFont(family="Inter", size=14, weight="bold")
 
         # --- ICON DEFINITIONS ---
-        app_path = os.path.dirname(os.path.abspath(__file__))
-        icons_path = os.path.join(app_path, '..', 'icons')
+        # Icons (self.backup_icon etc.) are loaded on first access; see ICON_FILES and __getattr__.
 
-        self.backup_icon = self._load_icon(os.path.join(icons_path, 'backup.png'))
-        self.briefing_icon = self._load_icon(os.path.join(icons_path, 'briefing.png'))
-        self.delete_icon = self._load_icon(os.path.join(icons_path, 'delete.png'))
-        self.new_icon = self._load_icon(os.path.join(icons_path, 'new.png'))
-        # We will ignore the missing restore icon for now
-        self.restore_icon = self._load_icon(os.path.join(icons_path, 'restore.png')) 
-        self.search_icon = self._load_icon(os.path.join(icons_path, 'search.png'))
-        self.update_icon = self._load_icon(os.path.join(icons_path, 'update.png'))
-        
         # --- NEW: Default placeholder for the profile picture ---
         self.default_avatar = self._create_placeholder_avatar()
 
+        # Avatars already turned into CTkImages, by (url, size); the disk cache sits behind it.
+        self._avatars = OrderedDict()
+        self._avatars_lock = threading.Lock()
+        self.image_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="ImageLoader")
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't set yet: load the icon and keep it for next time.
+        if name not in ICON_FILES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        icon = self._load_icon(os.path.join(ICONS_PATH, ICON_FILES[name]))
+        setattr(self, name, icon)
+        return icon
+
     def _load_icon(self, path, size=(20, 20)):
         """Helper function to load and resize an icon."""
         try:
@@ -44,31 +65,42 @@ class AppAssets:
         draw.ellipse((0, 0, size[0], size[1]), fill='#4B4B4B')
         return customtkinter.CTkImage(img, size=size)
 
+    def cached_avatar(self, url, size=(48, 48)):
+        """Returns the avatar for url if it is already in memory, else None. Cheap enough for the Tk thread."""
+        key = (url, size)
+        with self._avatars_lock:
+            image = self._avatars.get(key)
+            if image is not None:
+                self._avatars.move_to_end(key)
+            return image
+
     # --- NEW: Function to load an avatar from a URL ---
     def load_avatar_from_url(self, url, size=(48, 48)):
-        """Downloads an image from a URL and returns it as a CTkImage."""
+        """
+        Returns the avatar at url as a circular CTkImage, or the default avatar if it can't be loaded.
+        Recently shown avatars come from memory and others from the disk cache (see avatar_cache),
+        so reopening a post doesn't go to the network.
+        """
+        image = self.cached_avatar(url, size)
+        if image is not None:
+            return image
+
+        # Imported here so requests isn't loaded at startup; this runs on the image executor.
+        from . import avatar_cache
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Open the image from the downloaded bytes
-            img_data = BytesIO(response.content)
-            img = Image.open(img_data)
-            
-            # Create a circular mask
-            mask = Image.new('L', size, 0)
-            draw = ImageDraw.Draw(mask)
-            draw.ellipse((0, 0, size[0], size[1]), fill=255)
-            
-            # Apply the mask to the image
-            img = img.resize(size)
-            img.putalpha(mask)
-            
-            return customtkinter.CTkImage(img, size=size)
+            image = customtkinter.CTkImage(avatar_cache.load_avatar(url, size), size=size)
         except Exception as e:
             print(f"Failed to load avatar from URL: {e}")
             return self.default_avatar
 
+        key = (url, size)
+        with self._avatars_lock:
+            self._avatars[key] = image
+            self._avatars.move_to_end(key)
+            while len(self._avatars) > AVATAR_MEMORY_ENTRIES:
+                self._avatars.popitem(last=False)
+        return image
+
 def load_assets():
     print("Loading application assets...")
     return AppAssets()
\ No newline at end of file
@@ -0,0 +1,153 @@
+# app/avatar_cache.py
+
+import hashlib
+import os
+import threading
+import time
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image, ImageDraw, PngImagePlugin
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'avatar_cache')
+# A cached avatar younger than this is used as is; an older one is revalidated with the server first.
+MAX_AGE = 24 * 60 * 60
+# Once the cache grows past this, the least recently used avatars are deleted.
+MAX_CACHE_BYTES = 20 * 1024 * 1024
+# (connect, read) timeouts in seconds, so a slow image host can't hang an avatar load.
+REQUEST_TIMEOUT = (5, 10)
+
+_session = None
+_session_lock = threading.Lock()
+_eviction_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Returns the shared session, so avatar downloads reuse pooled connections to the image host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def cache_path(url: str, size: tuple) -> str:
+    key = hashlib.sha256(f"{size[0]}x{size[1]}:{url}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.png")
+
+def make_circular(image: Image.Image, size: tuple) -> Image.Image:
+    """Resizes an image to size and cuts it to a circle."""
+    mask = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0, size[0], size[1]), fill=255)
+
+    image = image.convert('RGBA').resize(size)
+    image.putalpha(mask)
+    return image
+
+def load_avatar(url: str, size: tuple = (48, 48)) -> Image.Image:
+    """
+    Returns the avatar at url as a circular PIL image of the given size.
+
+    The processed image is kept on disk with the response's ETag and Last-Modified,
+    so a fresh copy costs no network at all and a stale one costs a conditional GET
+    that usually answers 304 Not Modified. If the server can't be reached, a stale
+    copy is still better than none and is returned.
+
+    Raises:
+        requests.RequestException or OSError: If the avatar is neither cached nor downloadable.
+    """
+    path = cache_path(url, size)
+    cached, validators = _read_cached(path)
+    if cached is not None and time.time() - float(validators.get('fetched-at', 0)) < MAX_AGE:
+        _touch(path)
+        return cached
+
+    request_headers = {}
+    if cached is not None:
+        if validators.get('etag'):
+            request_headers['If-None-Match'] = validators['etag']
+        if validators.get('last-modified'):
+            request_headers['If-Modified-Since'] = validators['last-modified']
+
+    try:
+        response = get_session().get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached is not None:
+            # Still current: store it again so it counts as fresh for another MAX_AGE.
+            _write_cached(path, cached, validators)
+            return cached
+        response.raise_for_status()
+    except requests.RequestException:
+        if cached is not None:
+            return cached
+        raise
+
+    image = make_circular(Image.open(BytesIO(response.content)), size)
+    _write_cached(path, image, {
+        'etag': response.headers.get('ETag'),
+        'last-modified': response.headers.get('Last-Modified'),
+    })
+    return image
+
+def _read_cached(path):
+    """
+    Returns (image, validators) for a cached avatar, or (None, {}) if there is no usable copy.
+    validators holds the etag and last-modified the server sent, and when the copy was fetched.
+    """
+    try:
+        with Image.open(path) as cached:
+            cached.load()
+            return cached.copy(), dict(cached.text)
+    except (OSError, ValueError):
+        return None, {}
+
+def _write_cached(path, image, validators):
+    # The validators ride along in PNG text chunks, so each avatar is a single file.
+    info = PngImagePlugin.PngInfo()
+    for key in ('etag', 'last-modified'):
+        if validators.get(key):
+            info.add_text(key, validators[key])
+    info.add_text('fetched-at', str(time.time()))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write under a temporary name so a reader never sees half a file.
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        image.save(temporary_path, format='PNG', pnginfo=info)
+        os.replace(temporary_path, path)
+    except OSError as e:
+        print(f"Could not cache avatar: {e}")
+        return
+    evict(MAX_CACHE_BYTES)
+
+def _touch(path):
+    # The modification time means "last used", which is what eviction orders by.
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def evict(max_bytes: int = MAX_CACHE_BYTES):
+    """Deletes the least recently used avatars until the cache is no larger than max_bytes."""
+    with _eviction_lock:
+        try:
+            entries = []
+            with os.scandir(CACHE_DIR) as it:
+                for entry in it:
+                    if entry.name.endswith('.png'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -2,18 +2,172 @@
 
 import sqlite3
 import os
-
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row 
-    return conn
+import re
+import json
+import base64
+import threading
+import time
+from contextlib import contextmanager
 
 DATABASE_FILE = "curators_vault.db"
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', DATABASE_FILE)
 
-def init_db():
+# --- Connection Manager ---
+# Each thread keeps one long-lived connection instead of opening a new one per call.
+# WAL mode lets the desktop app and dashboard.py read while the other one writes.
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+_generation = 0
+
+def _connect(path):
+    # isolation_level=None leaves transaction control to transaction() below.
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def get_db_connection():
+    """Returns this thread's connection, opening it on first use or after reset_connections()."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.path == DB_PATH and _local.generation == _generation:
+        return conn
+    if conn is not None:
+        conn.close()
+    _local.conn = _connect(DB_PATH)
+    _local.path = DB_PATH
+    _local.generation = _generation
+    _local.depth = 0
+    _local.pending_changes = []
+    return _local.conn
+
+def close_db_connection():
+    """Closes this thread's connection, if it has one."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+def reset_connections():
+    """
+    Makes every thread reopen its connection on next use.
+    Call this after the database file has been replaced (e.g. by a restore).
+    """
+    global _generation
+    _generation += 1
+    close_db_connection()
+    invalidate_lookup_cache()
+
+def checkpoint():
+    """Copies everything in the WAL back into the main database file."""
+    get_db_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+@contextmanager
+def transaction():
+    """
+    Runs the enclosed statements in one transaction and yields the connection.
+    Nested uses join the outermost transaction, so several operations share one commit.
+    """
     conn = get_db_connection()
-    cursor = conn.cursor()
+    outermost = _local.depth == 0
+    if outermost:
+        # IMMEDIATE takes the write lock up front, so a concurrent writer waits on
+        # busy_timeout here instead of failing later when the read lock is upgraded.
+        conn.execute("BEGIN IMMEDIATE")
+    _local.depth += 1
+    try:
+        yield conn
+    except BaseException:
+        _local.depth -= 1
+        if outermost:
+            conn.execute("ROLLBACK")
+            # The cache may hold rows this transaction inserted.
+            invalidate_lookup_cache()
+            # Nothing happened, so nobody is told about it.
+            _local.pending_changes = []
+        raise
+    _local.depth -= 1
+    if outermost:
+        conn.execute("COMMIT")
+        _send_changes()
+
+# --- Change Notifications ---
+# Writes record what they changed with _notify_change(kind, ids). Listeners added with
+# subscribe_changes() hear about it once the transaction commits, on the thread that
+# committed, and not at all if it rolls back. The kinds are the table names.
+POSTS_CHANGED = "posts"
+PROJECTS_CHANGED = "projects"
+CATEGORIES_CHANGED = "categories"
+
+_change_listeners = []
+_change_listeners_lock = threading.Lock()
+
+def subscribe_changes(listener):
+    """
+    Calls listener(kind, ids) after every commit that changed posts, projects or categories.
+    kind is one of the *_CHANGED constants; ids is a frozenset of the changed rows' ids,
+    or None when they aren't known (e.g. every post in a deleted category).
+
+    Returns:
+        A function that unsubscribes the listener.
+    """
+    with _change_listeners_lock:
+        _change_listeners.append(listener)
+
+    def unsubscribe():
+        with _change_listeners_lock:
+            if listener in _change_listeners:
+                _change_listeners.remove(listener)
+    return unsubscribe
+
+def _notify_change(kind, ids=None):
+    """Records a change in the current transaction; it is sent when the transaction commits."""
+    _local.pending_changes.append((kind, frozenset(ids) if ids is not None else None))
+    if _local.depth == 0:
+        _send_changes()
+
+def _send_changes():
+    changes, _local.pending_changes = _local.pending_changes, []
+    if not changes:
+        return
+    with _change_listeners_lock:
+        listeners = list(_change_listeners)
+    for kind, ids in changes:
+        for listener in listeners:
+            try:
+                listener(kind, ids)
+            except Exception as e:
+                print(f"Change listener failed: {e}")
+
+# Markers wrapped around matched terms in search snippets.
+SNIPPET_OPEN = "\u00ab"
+SNIPPET_CLOSE = "\u00bb"
+
+# Stored in PRAGMA user_version once _migrate() has run. Bump it whenever _migrate() changes,
+# so databases created before the change are migrated again; at the current version it's skipped.
+SCHEMA_VERSION = 2
+
+def init_db():
+    """Brings the schema up to date. A database already at SCHEMA_VERSION costs a single PRAGMA."""
+    invalidate_lookup_cache()
+    if get_db_connection().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        return
+    with transaction() as conn:
+        _migrate(conn.cursor())
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    invalidate_lookup_cache()
+    print("Database initialized and migrated successfully.")
+
+def _migrate(cursor):
     
     # --- Existing Tables (No changes here) ---
     cursor.execute('''
@@ -56,6 +210,13 @@ def init_db():
         print("Migrating database: Adding 'resources' to posts table...")
         cursor.execute("ALTER TABLE posts ADD COLUMN resources TEXT")
 
+    # --- Optimistic locking for Spark Board saves: bumped on every layout change ---
+    cursor.execute("PRAGMA table_info(projects)")
+    project_columns = [row['name'] for row in cursor.fetchall()]
+    if 'layout_version' not in project_columns:
+        print("Migrating database: Adding 'layout_version' to projects table...")
+        cursor.execute("ALTER TABLE projects ADD COLUMN layout_version INTEGER NOT NULL DEFAULT 0")
+
     # --- ADDED: Create the 'sparks' table for the Spark Board layout ---
     print("Ensuring 'sparks' table exists...")
     cursor.execute('''
@@ -85,130 +246,850 @@ def init_db():
         )
     ''')
 
+    # --- Scraped post data, so re-fetching a URL doesn't start a browser (see get_cached_scrape) ---
+    print("Ensuring 'scrape_cache' table exists...")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_cache (
+            status_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    ''')
+
+    # --- Durable queue of URLs waiting to be scraped (see enqueue_scrape_jobs) ---
+    print("Ensuring 'scrape_jobs' table exists...")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            result TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    ''')
+
+    # --- Small key/value store for bookkeeping, e.g. where a backfill stopped (see get_state) ---
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS app_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+    # --- Full-text search index over author, post text and notes ---
+    _ensure_posts_fts(cursor)
+
+    # --- Indexes for the hot queries (see hot_queries() below) ---
+    # projects.name and categories.name are UNIQUE, so their lookups already have an index.
+    for statement in INDEXES:
+        cursor.execute(statement)
+
     cursor.execute("INSERT OR IGNORE INTO projects (id, name, description) VALUES (?, ?, ?)", 
                    (1, "Uncategorized Ideas", "A place for posts that haven't been assigned to a specific project yet."))
-                   
-    conn.commit()
+    # Posts saved before projects existed have none; they belong to Uncategorized Ideas. Saves never
+    # store NULL, so filtering a project is a plain project_id = ? that its index returns in order.
+    cursor.execute("UPDATE posts SET project_id = 1 WHERE project_id IS NULL")
+
+def _ensure_posts_fts(cursor):
+    """
+    Creates the FTS5 index for posts and the triggers that keep it in sync.
+    The index is an external-content table, so it stores no second copy of the text.
+    Existing rows are backfilled once, the first time the index is created.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+    needs_backfill = cursor.fetchone() is None
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+            author,
+            post_text,
+            notes,
+            content='posts',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, author, post_text, notes)
+            VALUES (new.id, new.author, new.post_text, new.notes);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, author, post_text, notes)
+            VALUES ('delete', old.id, old.author, old.post_text, old.notes);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF author, post_text, notes ON posts BEGIN
+            INSERT INTO posts_fts (posts_fts, rowid, author, post_text, notes)
+            VALUES ('delete', old.id, old.author, old.post_text, old.notes);
+            INSERT INTO posts_fts (rowid, author, post_text, notes)
+            VALUES (new.id, new.author, new.post_text, new.notes);
+        END
+    ''')
+
+    if needs_backfill:
+        print("Migrating database: Building full-text search index for posts...")
+        cursor.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+
+INDEXES = [
+    # Post lists ordered newest first, overall and per project. The trailing columns
+    # also cover the per-project COUNT/MAX on the dashboard's Project Hub.
+    "CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_project_created ON posts (project_id, created_at DESC, id DESC)",
+    # Duplicate checks when importing URLs in bulk.
+    "CREATE INDEX IF NOT EXISTS idx_posts_url ON posts (url)",
+    # Spark Board loads, plus the lookups foreign key checks make when posts and sparks are deleted.
+    "CREATE INDEX IF NOT EXISTS idx_sparks_project ON sparks (project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_sparks_post ON sparks (post_id)",
+    "CREATE INDEX IF NOT EXISTS idx_connections_project ON connections (project_id)",
+    "CREATE INDEX IF NOT EXISTS idx_connections_start ON connections (start_spark_id)",
+    "CREATE INDEX IF NOT EXISTS idx_connections_end ON connections (end_spark_id)",
+    # The scrape queue worker's next due job, and duplicate checks when URLs are queued.
+    "CREATE INDEX IF NOT EXISTS idx_scrape_jobs_due ON scrape_jobs (status, next_attempt_at)",
+    "CREATE INDEX IF NOT EXISTS idx_scrape_jobs_url ON scrape_jobs (url)",
+    # Least recently used first, for scrape cache eviction.
+    "CREATE INDEX IF NOT EXISTS idx_scrape_cache_last_used ON scrape_cache (last_used)",
+]
+
+# The dashboard's Project Hub and Spark Board queries. They live here so that
+# check_query_plans() checks the SQL dashboard.py actually runs.
+# The hub joins projects with posts to get the count and the latest post date;
+# LEFT JOIN is used to include projects that have 0 posts.
+PROJECT_HUB_QUERY = '''
+    SELECT 
+        p.id, 
+        p.name, 
+        p.description,
+        COUNT(posts.id) as idea_count,
+        MAX(posts.created_at) as last_spark_timestamp
+    FROM projects p
+    LEFT JOIN posts ON posts.project_id = p.id
+    GROUP BY p.id, p.name, p.description
+    ORDER BY last_spark_timestamp DESC, p.name
+'''
+BOARD_SPARKS_QUERY = "SELECT * FROM sparks WHERE project_id = ?"
+BOARD_CONNECTIONS_QUERY = "SELECT * FROM connections WHERE project_id = ?"
+# The Idea Stream is paginated, so the board can't rely on it holding every post a spark points at.
+BOARD_POSTS_QUERY = '''
+    SELECT * FROM posts
+    WHERE id IN (SELECT post_id FROM sparks WHERE project_id = ?)
+'''
+
+# Single-table lookups made on saves, imports and by the scrape queue, as their functions run them.
+HOT_QUERIES = {
+    "sparks_by_post": ("SELECT id FROM sparks WHERE post_id = ?", (2,)),
+    "posts_by_url": ("SELECT url FROM posts WHERE url IN (?, ?)", ("a", "b")),
+    "project_by_name": ("SELECT id FROM projects WHERE name = ?", ("name",)),
+    "category_by_name": ("SELECT id FROM categories WHERE name = ?", ("name",)),
+    "scrape_cache_lookup": ("SELECT data, fetched_at FROM scrape_cache WHERE status_id = ?", ("1",)),
+    "scrape_cache_oldest": ("SELECT status_id FROM scrape_cache ORDER BY last_used LIMIT ?", (10,)),
+    "scrape_job_next_due": ("SELECT id FROM scrape_jobs WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT 1", ("queued", 0)),
+    "scrape_job_by_url": ("SELECT id FROM scrape_jobs WHERE url = ? AND status IN (?, ?)", ("a", "queued", "running")),
+    "posts_search": ("SELECT rowid FROM posts_fts WHERE posts_fts MATCH ? ORDER BY bm25(posts_fts)", ('"term"*',)),
+}
+
+# HOT_QUERIES that read a few rows in index order; sorting everything they match first would defeat the LIMIT.
+INDEX_ORDERED_HOT_QUERIES = {"scrape_cache_oldest", "scrape_job_next_due"}
+
+def hot_queries():
+    """
+    Returns {name: (query, params, index_ordered)} for the queries that run on every list
+    refresh, save or board load: the post list exactly as _build_posts_query() builds it
+    for each filter and cursor, the dashboard's queries, and HOT_QUERIES.
+
+    index_ordered is True for queries that must read rows in ORDER BY order straight from
+    an index: the pages of a plain post list and the LIMITed lookups. Search pages are
+    ordered by bm25 relevance, which no index holds, so they sort their matches.
+    """
+    queries = {}
+    for search_term in (None, "term"):
+        cursor = (0.0, 1) if search_term else ("2024-01-01 00:00:00", 1)
+        for project_id in (None, 1, 2):
+            # get_all_posts(), then the first and a later page of get_posts_page().
+            for after, limit in ((None, None), (None, PAGE_SIZE + 1), (cursor, PAGE_SIZE + 1)):
+                query, params, _ = _build_posts_query(search_term, project_id, after, limit)
+                name = f"posts(search={search_term!r}, project_id={project_id}, after={after is not None}, limit={limit})"
+                queries[name] = (query, params, limit is not None and not search_term)
+    queries["project_hub"] = (PROJECT_HUB_QUERY, (), False)
+    queries["board_sparks"] = (BOARD_SPARKS_QUERY, (2,), False)
+    queries["board_connections"] = (BOARD_CONNECTIONS_QUERY, (2,), False)
+    queries["board_posts"] = (BOARD_POSTS_QUERY, (2,), False)
+    for name, (query, params) in HOT_QUERIES.items():
+        queries[name] = (query, params, name in INDEX_ORDERED_HOT_QUERIES)
+    return queries
+
+def check_query_plans(queries=None):
+    """
+    Runs EXPLAIN QUERY PLAN on each query (by default, every one from hot_queries())
+    against a fresh in-memory copy of the schema, so the result depends on the
+    migrations rather than on the size or ANALYZE statistics of whatever vault
+    happens to be open.
+
+    Args:
+        queries: {name: (query, params, index_ordered)} to check instead of the hot
+            queries; see hot_queries(). index_ordered may be left out and is then False.
+
+    Returns:
+        A list of (query name, plan detail) pairs for steps that scan a whole table
+        without an index, or that sort the results of an index_ordered query. An empty
+        list means every query is indexed.
+    """
+    if queries is None:
+        queries = hot_queries()
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    _migrate(conn.cursor())
+    full_scans = []
+    for name, (query, params, *index_ordered) in queries.items():
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params):
+            detail = row['detail']
+            # "SCAN posts" reads every row; "SCAN posts USING INDEX ..." walks an index in order,
+            # and FTS5 lookups show up as "SCAN posts_fts VIRTUAL TABLE INDEX ...".
+            if detail.startswith("SCAN ") and " USING " not in detail and " VIRTUAL TABLE " not in detail:
+                full_scans.append((name, detail))
+            # A page that sorts everything it matches before applying LIMIT costs as much as the whole list.
+            elif any(index_ordered) and detail.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in detail:
+                full_scans.append((name, detail))
     conn.close()
-    print("Database initialized and migrated successfully.")
+    return full_scans
+
+def build_fts_query(search_term):
+    """
+    Turns free text from the search box into an FTS5 MATCH expression.
+    Every word must match, and the last word may be a prefix so results appear while typing.
+
+    Returns:
+        The MATCH expression, or None if the search term contains no searchable words.
+    """
+    if not search_term:
+        return None
+    words = re.findall(r"\w+", search_term)
+    if not words:
+        return None
+    # Quoting each word keeps FTS5 operators (AND, OR, NEAR, ...) from being parsed.
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# --- Lookup Cache ---
+# Projects and categories are small and read on every save and combobox refresh, so each
+# table is cached whole (rows, name -> id, ordered names). Writes made here invalidate
+# it explicitly. Writes from other connections (e.g. dashboard.py creating a project)
+# bump PRAGMA data_version on the connection the cache was filled from, which
+# invalidates it on the next read.
+_lookup_lock = threading.Lock()
+_lookup_cache = {}
+_lookup_epoch = 0
+
+def invalidate_lookup_cache():
+    """Drops the cached projects and categories; the next lookup re-reads them."""
+    global _lookup_epoch
+    with _lookup_lock:
+        _lookup_epoch += 1
+        _lookup_cache.clear()
 
-# --- The rest of your database.py file remains the same ---
-# (get_or_create_project_id, add_post, update_post, etc. do not need changes yet)
+def _get_lookup(table, conn=None):
+    """Returns the cache entry for 'projects' or 'categories', reloading it if stale."""
+    conn = conn or get_db_connection()
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    with _lookup_lock:
+        entry = _lookup_cache.get(table)
+        if entry is not None and entry['conn'] is conn and entry['version'] == version:
+            return entry
+        epoch = _lookup_epoch
+
+    rows = [dict(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY name")]
+    entry = {
+        'conn': conn,
+        'version': version,
+        'rows': rows,
+        'ids': {row['name']: row['id'] for row in rows},
+        'names': [row['name'] for row in rows]
+    }
+    with _lookup_lock:
+        # Don't store a snapshot that an invalidation raced past while we were reading.
+        if epoch == _lookup_epoch:
+            _lookup_cache[table] = entry
+    return entry
+
+def _get_or_create_id(conn, table, name):
+    cached_id = _get_lookup(table, conn)['ids'].get(name)
+    if cached_id is not None:
+        return cached_id
+    cursor = conn.cursor()
+    cursor.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,))
+    invalidate_lookup_cache()
+    _notify_change(table, {cursor.lastrowid})
+    return cursor.lastrowid
 
 def get_or_create_project_id(conn, name):
     if not name or not name.strip():
         return 1
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM projects WHERE name = ?", (name,))
-    project = cursor.fetchone()
-    if project:
-        return project['id']
-    else:
-        cursor.execute("INSERT INTO projects (name) VALUES (?)", (name,))
-        conn.commit()
-        return cursor.lastrowid
+    return _get_or_create_id(conn, "projects", name)
 
 def get_or_create_category_id(conn, name):
     if not name or not name.strip():
         return None
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM categories WHERE name = ?", (name,))
-    category = cursor.fetchone()
-    if category:
-        return category['id']
-    else:
-        cursor.execute("INSERT INTO categories (name) VALUES (?)", (name,))
-        conn.commit()
-        return cursor.lastrowid
+    return _get_or_create_id(conn, "categories", name)
 
 def get_all_projects():
-    conn = get_db_connection()
-    projects_rows = conn.execute("SELECT * FROM projects ORDER BY name").fetchall()
-    conn.close()
-    return [dict(row) for row in projects_rows]
+    return [dict(row) for row in _get_lookup("projects")['rows']]
+
+def get_project_names():
+    """Returns all project names in display order, from the lookup cache."""
+    return list(_get_lookup("projects")['names'])
 
 def add_post(author, post_text, notes, url, category_name, project_name, avatar_url, resources=None):
+    with transaction() as conn:
+        project_id = get_or_create_project_id(conn, project_name)
+        category_id = get_or_create_category_id(conn, category_name)
+
+        # --- MODIFIED: Added 'resources' to the INSERT statement ---
+        cursor = conn.execute(
+            "INSERT INTO posts (author, post_text, notes, url, category_id, project_id, avatar_url, resources) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (author, post_text, notes, url, category_id, project_id, avatar_url, resources)
+        )
+        _notify_change(POSTS_CHANGED, {cursor.lastrowid})
+
+# Fields of a post record accepted by add_posts_bulk(); they mirror add_post()'s arguments.
+POST_RECORD_FIELDS = ("author", "post_text", "notes", "url", "category_name", "project_name", "avatar_url", "resources")
+# SQLite caps the number of bound parameters per statement; name lookups are chunked below it.
+_MAX_LOOKUP_PARAMS = 500
+
+def _get_or_create_ids(conn, table, names):
+    """
+    Resolves many project or category names at once, inserting the missing ones.
+    This is the batched form of get_or_create_project_id/get_or_create_category_id.
+
+    Returns:
+        A dict mapping each name to its id.
+    """
+    # The cache holds the whole table and was just checked against data_version,
+    # so any name it doesn't know is missing from the database too.
+    cached_ids = _get_lookup(table, conn)['ids']
+    ids = {name: cached_ids[name] for name in names if name in cached_ids}
+    missing = [name for name in names if name not in ids]
+    if missing:
+        conn.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", [(name,) for name in missing])
+        invalidate_lookup_cache()
+        for i in range(0, len(missing), _MAX_LOOKUP_PARAMS):
+            chunk = missing[i:i + _MAX_LOOKUP_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT id, name FROM {table} WHERE name IN ({placeholders})", chunk):
+                ids[row['name']] = row['id']
+        _notify_change(table, {ids[name] for name in missing if name in ids})
+    return ids
+
+def get_existing_urls(urls):
+    """Returns the subset of `urls` that are already saved as a post's URL."""
+    urls = list(dict.fromkeys(urls))
+    existing = set()
     conn = get_db_connection()
-    project_id = get_or_create_project_id(conn, project_name)
-    category_id = get_or_create_category_id(conn, category_name)
-    
-    # --- MODIFIED: Added 'resources' to the INSERT statement ---
-    conn.execute(
-        "INSERT INTO posts (author, post_text, notes, url, category_id, project_id, avatar_url, resources) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        (author, post_text, notes, url, category_id, project_id, avatar_url, resources)
-    )
-    conn.commit()
-    conn.close()
+    for i in range(0, len(urls), _MAX_LOOKUP_PARAMS):
+        chunk = urls[i:i + _MAX_LOOKUP_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        existing.update(row['url'] for row in conn.execute(f"SELECT url FROM posts WHERE url IN ({placeholders})", chunk))
+    return existing
+
+def add_posts_bulk(records):
+    """
+    Inserts many posts in a single transaction.
+
+    Args:
+        records: An iterable of dicts with the keys in POST_RECORD_FIELDS. Only
+            'post_text' is required; project and category names are created as needed.
+
+    Returns:
+        (inserted_count, errors), where errors is a list of (index, message) pairs
+        for the records that were skipped. Index is the record's position in `records`.
+    """
+    errors = []
+    valid = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors.append((index, "Record is not a dict."))
+        elif not record.get("post_text") or not str(record["post_text"]).strip():
+            errors.append((index, "Record has no post_text."))
+        else:
+            # Names are looked up and stripped as text; a number or list would fail the whole batch.
+            bad_field = next((field for field in ("project_name", "category_name")
+                              if record.get(field) is not None and not isinstance(record[field], str)), None)
+            if bad_field:
+                errors.append((index, f"Record's {bad_field} is not a string."))
+            else:
+                valid.append((index, record))
+
+    if not valid:
+        return 0, errors
+
+    def clean_name(name):
+        return name if name and name.strip() else None
+
+    with transaction() as conn:
+        project_ids = _get_or_create_ids(conn, "projects", {clean_name(r.get("project_name")) for _, r in valid} - {None})
+        category_ids = _get_or_create_ids(conn, "categories", {clean_name(r.get("category_name")) for _, r in valid} - {None})
+
+        rows = []
+        for index, record in valid:
+            project_name = clean_name(record.get("project_name"))
+            category_name = clean_name(record.get("category_name"))
+            rows.append((
+                index,
+                (
+                    record.get("author"), record["post_text"], record.get("notes"), record.get("url"),
+                    category_ids.get(category_name), project_ids.get(project_name, 1),
+                    record.get("avatar_url"), record.get("resources")
+                )
+            ))
+
+        insert_sql = "INSERT INTO posts (author, post_text, notes, url, category_id, project_id, avatar_url, resources) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        conn.execute("SAVEPOINT bulk_insert")
+        try:
+            conn.executemany(insert_sql, [values for _, values in rows])
+            conn.execute("RELEASE bulk_insert")
+            inserted = len(rows)
+        except sqlite3.Error:
+            # Something in the batch was rejected. Retry row by row to find out which
+            # records failed, keeping the rest.
+            conn.execute("ROLLBACK TO bulk_insert")
+            conn.execute("RELEASE bulk_insert")
+            inserted = 0
+            for index, values in rows:
+                conn.execute("SAVEPOINT bulk_row")
+                try:
+                    conn.execute(insert_sql, values)
+                    conn.execute("RELEASE bulk_row")
+                    inserted += 1
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO bulk_row")
+                    conn.execute("RELEASE bulk_row")
+                    errors.append((index, str(e)))
+        if inserted:
+            _notify_change(POSTS_CHANGED)
+
+    errors.sort()
+    return inserted, errors
 
 def update_post(post_id, author, post_text, notes, url, category_name, project_name, avatar_url, resources=None):
-    conn = get_db_connection()
-    project_id = get_or_create_project_id(conn, project_name)
-    category_id = get_or_create_category_id(conn, category_name)
-
-    # --- MODIFIED: Added 'resources' to the UPDATE statement ---
-    conn.execute('''
-        UPDATE posts
-        SET author = ?, post_text = ?, notes = ?, url = ?, category_id = ?, project_id = ?, avatar_url = ?, resources = ?
-        WHERE id = ?
-    ''', (author, post_text, notes, url, category_id, project_id, avatar_url, resources, post_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        project_id = get_or_create_project_id(conn, project_name)
+        category_id = get_or_create_category_id(conn, category_name)
 
-def get_all_posts(search_term=None, project_id=None):
-    conn = get_db_connection()
-    # --- MODIFIED: Added p.resources to the SELECT statement ---
-    query = '''
-        SELECT p.id, p.author, p.post_text, p.notes, p.url, p.avatar_url, p.resources, c.name as category_name, proj.name as project_name
-        FROM posts p
-        LEFT JOIN categories c ON p.category_id = c.id
-        LEFT JOIN projects proj ON p.project_id = proj.id
-    '''
-    conditions = []
-    params = []
+        # --- MODIFIED: Added 'resources' to the UPDATE statement ---
+        conn.execute('''
+            UPDATE posts
+            SET author = ?, post_text = ?, notes = ?, url = ?, category_id = ?, project_id = ?, avatar_url = ?, resources = ?
+            WHERE id = ?
+        ''', (author, post_text, notes, url, category_id, project_id, avatar_url, resources, post_id))
+        _notify_change(POSTS_CHANGED, {post_id})
+
+# Posts per page for the paginated list views.
+PAGE_SIZE = 50
+
+def encode_cursor(sort_key, post_id):
+    """Packs the sort key and id of the last post on a page into an opaque, URL-safe token."""
+    raw = json.dumps([sort_key, post_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(token):
+    """
+    Reverses encode_cursor().
+
+    Raises:
+        ValueError: If the token was not produced by encode_cursor().
+    """
+    try:
+        sort_key, post_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not isinstance(post_id, int) or not isinstance(sort_key, (str, int, float)):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return sort_key, post_id
+
+# --- MODIFIED: Added p.resources to the SELECT statement ---
+POST_LIST_COLUMNS = "p.id, p.author, p.post_text, p.notes, p.url, p.avatar_url, p.resources, p.created_at, c.name as category_name, proj.name as project_name"
+
+def _build_posts_query(search_term=None, project_id=None, after=None, limit=None):
+    """
+    Builds the SELECT behind get_all_posts() and get_posts_page().
+
+    Plain listings are ordered by (created_at, id), newest first. Searches are ordered
+    by (score, id), where score is the bm25 relevance (lower is better). `after` is the
+    decoded cursor of the last row already shown; only rows after it are returned.
+
+    Returns:
+        (query, params, sort_column), where sort_column names the first part of the
+        ordering key in each returned row.
+    """
+    fts_query = build_fts_query(search_term)
+    columns = POST_LIST_COLUMNS
+    if fts_query:
+        query = f'''
+            SELECT {columns},
+                   snippet(posts_fts, -1, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '...', 12) as snippet,
+                   bm25(posts_fts) as score
+            FROM posts_fts
+            JOIN posts p ON p.id = posts_fts.rowid
+            LEFT JOIN categories c ON p.category_id = c.id
+            LEFT JOIN projects proj ON p.project_id = proj.id
+        '''
+        conditions = ["posts_fts MATCH ?"]
+        params = [fts_query]
+    else:
+        query = f'''
+            SELECT {columns}
+            FROM posts p
+            LEFT JOIN categories c ON p.category_id = c.id
+            LEFT JOIN projects proj ON p.project_id = proj.id
+        '''
+        conditions = []
+        params = []
     if project_id:
-        if project_id == 1:
-            conditions.append("(p.project_id = ? OR p.project_id IS NULL)")
-            params.append(project_id)
-        else:
-            conditions.append("p.project_id = ?")
-            params.append(project_id)
-    if search_term and search_term.strip() != "":
-        search_condition = "(p.author LIKE ? OR p.post_text LIKE ? OR p.notes LIKE ?)"
-        conditions.append(search_condition)
-        like_term = f"%{search_term}%"
-        params.extend([like_term, like_term, like_term])
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-    query += " ORDER BY p.created_at DESC"
-    posts_rows = conn.execute(query, params).fetchall()
-    conn.close()
+        conditions.append("p.project_id = ?")
+        params.append(project_id)
+
+    if fts_query:
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # bm25() is only valid in the full-text query itself, so the cursor is applied one level up.
+        query = f"SELECT * FROM ({query})"
+        if after is not None:
+            score, last_id = after
+            query += " WHERE score > ? OR (score = ? AND id < ?)"
+            params.extend([score, score, last_id])
+        query += " ORDER BY score, id DESC"
+        sort_column = "score"
+    else:
+        if after is not None:
+            conditions.append("(p.created_at, p.id) < (?, ?)")
+            params.extend(after)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY p.created_at DESC, p.id DESC"
+        sort_column = "created_at"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return query, params, sort_column
+
+def get_all_posts(search_term=None, project_id=None):
+    """
+    Returns every matching post, newest first.
+    When a search term is given, results come from the full-text index ordered by
+    relevance (bm25) and each post carries a 'snippet' with the matched terms marked.
+    """
+    query, params, _ = _build_posts_query(search_term, project_id)
+    posts_rows = get_db_connection().execute(query, params).fetchall()
     return [dict(row) for row in posts_rows]
 
-def get_all_categories():
+def iter_posts(search_term=None, project_id=None, batch_size=500):
+    """
+    Yields the same posts as get_all_posts() one at a time, reading them from a
+    cursor in batches so large result sets are never held in memory at once.
+    """
+    query, params, _ = _build_posts_query(search_term, project_id)
+    cursor = get_db_connection().execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        cursor.close()
+
+def count_posts(search_term=None, project_id=None):
+    """Returns how many posts get_all_posts() would return."""
+    query, params, _ = _build_posts_query(search_term, project_id)
+    return get_db_connection().execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+def get_posts_page(search_term=None, project_id=None, cursor=None, limit=PAGE_SIZE):
+    """
+    Returns one page of the same results as get_all_posts(), using keyset pagination.
+
+    Args:
+        cursor: The next_cursor token from the previous page, or None for the first page.
+        limit: The maximum number of posts on the page.
+
+    Returns:
+        (posts, next_cursor), where next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is not a valid token.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # One extra row tells us whether there is another page without a COUNT query.
+    query, params, sort_column = _build_posts_query(search_term, project_id, after, limit + 1)
+    posts = [dict(row) for row in get_db_connection().execute(query, params).fetchall()]
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        next_cursor = encode_cursor(last[sort_column], last['id'])
+    return posts, next_cursor
+
+def get_posts_by_ids(post_ids):
+    """
+    Returns the posts with the given ids, shaped like get_posts_page()'s and newest first,
+    so a list can re-read just the rows that changed. Ids with no post (deleted) are left out.
+    """
+    post_ids = list(post_ids)
+    posts = []
     conn = get_db_connection()
-    categories_rows = conn.execute("SELECT * FROM categories ORDER BY name").fetchall()
-    conn.close()
-    return [dict(row) for row in categories_rows]
+    for i in range(0, len(post_ids), _MAX_LOOKUP_PARAMS):
+        chunk = post_ids[i:i + _MAX_LOOKUP_PARAMS]
+        placeholders = ", ".join("?" * len(chunk))
+        posts.extend(dict(row) for row in conn.execute(f'''
+            SELECT {POST_LIST_COLUMNS}
+            FROM posts p
+            LEFT JOIN categories c ON p.category_id = c.id
+            LEFT JOIN projects proj ON p.project_id = proj.id
+            WHERE p.id IN ({placeholders})
+        ''', chunk))
+    posts.sort(key=lambda post: (post['created_at'], post['id']), reverse=True)
+    return posts
+
+def get_all_categories():
+    return [dict(row) for row in _get_lookup("categories")['rows']]
+
+def get_category_names():
+    """Returns all category names in display order, from the lookup cache."""
+    return list(_get_lookup("categories")['names'])
+
+def count_posts_after(post_id):
+    return get_db_connection().execute("SELECT COUNT(*) FROM posts WHERE id > ?", (post_id,)).fetchone()[0]
+
+def get_post_texts_after(post_id, limit):
+    """Returns up to `limit` posts with an id above post_id, in id order, as rows of id, post_text and resources."""
+    return get_db_connection().execute(
+        "SELECT id, post_text, resources FROM posts WHERE id > ? ORDER BY id LIMIT ?", (post_id, limit)
+    ).fetchall()
+
+def update_resources_batch(updates, progress_key=None, progress_value=None):
+    """
+    Sets the resources of many posts in one transaction. updates is a list of
+    (post_id, resources) pairs. If progress_key is given, progress_value is saved
+    under it in the same commit, so a job's bookmark never gets ahead of its writes.
+    """
+    with transaction() as conn:
+        conn.executemany("UPDATE posts SET resources = ? WHERE id = ?", [(resources, post_id) for post_id, resources in updates])
+        _notify_change(POSTS_CHANGED, {post_id for post_id, _ in updates})
+        if progress_key is not None:
+            set_state(progress_key, progress_value)
+
+def get_state(key, default=None):
+    row = get_db_connection().execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row is not None else default
+
+def set_state(key, value):
+    """Saves value (as text) under key in app_state; None removes the key."""
+    with transaction() as conn:
+        if value is None:
+            conn.execute("DELETE FROM app_state WHERE key = ?", (key,))
+        else:
+            conn.execute("INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)", (key, str(value)))
 
 def delete_post(post_id):
-    conn = get_db_connection()
-    conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        # Foreign keys are enforced, so the post's Spark Board notes and their connectors go first.
+        conn.execute('''
+            DELETE FROM connections
+            WHERE start_spark_id IN (SELECT id FROM sparks WHERE post_id = ?)
+               OR end_spark_id IN (SELECT id FROM sparks WHERE post_id = ?)
+        ''', (post_id, post_id))
+        conn.execute("DELETE FROM sparks WHERE post_id = ?", (post_id,))
+        conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+        _notify_change(POSTS_CHANGED, {post_id})
 
 def delete_project(project_id):
     if project_id == 1:
         print("Cannot delete the default 'Uncategorized Ideas' project.")
         return
-    conn = get_db_connection()
-    conn.execute("UPDATE posts SET project_id = 1 WHERE project_id = ?", (project_id,))
-    conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE posts SET project_id = 1 WHERE project_id = ?", (project_id,))
+        # The project's Spark Board goes with it.
+        conn.execute("DELETE FROM connections WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM sparks WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        # Its posts moved to the default project.
+        _notify_change(PROJECTS_CHANGED, {project_id})
+        _notify_change(POSTS_CHANGED)
+    invalidate_lookup_cache()
 
 def delete_category(category_id):
-    conn = get_db_connection()
-    conn.execute("UPDATE posts SET category_id = NULL WHERE category_id = ?", (category_id,))
-    conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    with transaction() as conn:
+        conn.execute("UPDATE posts SET category_id = NULL WHERE category_id = ?", (category_id,))
+        conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
+        _notify_change(CATEGORIES_CHANGED, {category_id})
+        _notify_change(POSTS_CHANGED)
+    invalidate_lookup_cache()
+
+# --- Scrape Cache ---
+# Results of PostScraper fetches, keyed by the post's status id. Entries older than
+# SCRAPE_CACHE_TTL seconds are ignored, and the least recently used are evicted
+# once there are more than SCRAPE_CACHE_MAX_ENTRIES.
+SCRAPE_CACHE_TTL = 7 * 24 * 60 * 60
+SCRAPE_CACHE_MAX_ENTRIES = 5000
+
+def get_cached_scrape(status_id, max_age=SCRAPE_CACHE_TTL):
+    """Returns the cached scrape for status_id, or None if there is none younger than max_age seconds."""
+    now = time.time()
+    with transaction() as conn:
+        row = conn.execute("SELECT data, fetched_at FROM scrape_cache WHERE status_id = ?", (status_id,)).fetchone()
+        if row is None or now - row['fetched_at'] > max_age:
+            return None
+        conn.execute("UPDATE scrape_cache SET last_used = ? WHERE status_id = ?", (now, status_id))
+    return json.loads(row['data'])
+
+def put_cached_scrape(status_id, data, max_entries=SCRAPE_CACHE_MAX_ENTRIES):
+    """Stores a scrape result for status_id, evicting the least recently used entries beyond max_entries."""
+    now = time.time()
+    with transaction() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO scrape_cache (status_id, data, fetched_at, last_used) VALUES (?, ?, ?, ?)",
+            (status_id, json.dumps(data), now, now)
+        )
+        excess = conn.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0] - max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM scrape_cache WHERE status_id IN (SELECT status_id FROM scrape_cache ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+
+# --- Scrape Job Queue ---
+# URLs waiting to be scraped, drained by app.scrape_queue.ScrapeQueueWorker. A job
+# moves from queued to running to done, or back to queued with a later
+# next_attempt_at after a failure, until it runs out of attempts and is failed.
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+SCRAPE_JOB_MAX_ATTEMPTS = 3
+
+def _job_from_row(row):
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+def enqueue_scrape_jobs(urls, max_attempts=SCRAPE_JOB_MAX_ATTEMPTS):
+    """
+    Queues URLs for scraping and returns their job ids, in order. A URL that is
+    already queued or running keeps its existing job instead of getting a second one.
+    """
+    now = time.time()
+    job_ids = []
+    with transaction() as conn:
+        for url in dict.fromkeys(urls):
+            row = conn.execute(
+                "SELECT id FROM scrape_jobs WHERE url = ? AND status IN (?, ?)", (url, JOB_QUEUED, JOB_RUNNING)
+            ).fetchone()
+            if row is not None:
+                job_ids.append(row['id'])
+                continue
+            cursor = conn.execute(
+                "INSERT INTO scrape_jobs (url, max_attempts, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (url, max_attempts, now, now, now)
+            )
+            job_ids.append(cursor.lastrowid)
+    return job_ids
+
+def claim_scrape_job():
+    """Marks the next due job as running and returns it, or returns None if no job is due."""
+    now = time.time()
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT id FROM scrape_jobs WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT 1",
+            (JOB_QUEUED, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE scrape_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+            (JOB_RUNNING, now, row['id'])
+        )
+        return _job_from_row(conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (row['id'],)).fetchone())
+
+def next_scrape_job_due_at():
+    """Returns when the earliest queued job is due (a time.time() value), or None if nothing is queued."""
+    return get_db_connection().execute(
+        "SELECT MIN(next_attempt_at) FROM scrape_jobs WHERE status = ?", (JOB_QUEUED,)
+    ).fetchone()[0]
+
+def complete_scrape_job(job_id, result):
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE scrape_jobs SET status = ?, result = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+            (JOB_DONE, json.dumps(result), time.time(), job_id)
+        )
+
+def fail_scrape_job(job_id, error, retry_delay):
+    """
+    Records a failed attempt. The job is queued again after retry_delay seconds
+    if it has attempts left, and is marked failed otherwise. Returns the new status.
+    """
+    now = time.time()
+    with transaction() as conn:
+        row = conn.execute("SELECT attempts, max_attempts FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        status = JOB_QUEUED if row['attempts'] < row['max_attempts'] else JOB_FAILED
+        conn.execute(
+            "UPDATE scrape_jobs SET status = ?, last_error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+            (status, error, now + retry_delay, now, job_id)
+        )
+    return status
+
+def retry_scrape_job(job_id):
+    """Queues a failed job again, with a fresh set of attempts."""
+    now = time.time()
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE scrape_jobs SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (JOB_QUEUED, now, now, job_id, JOB_FAILED)
+        )
+
+def requeue_running_scrape_jobs():
+    """Puts jobs left running by a worker that stopped mid-scrape back in the queue. Returns how many."""
+    now = time.time()
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE scrape_jobs SET status = ?, next_attempt_at = ?, updated_at = ? WHERE status = ?",
+            (JOB_QUEUED, now, now, JOB_RUNNING)
+        ).rowcount
+
+def get_scrape_job(job_id):
+    row = get_db_connection().execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+    return _job_from_row(row) if row is not None else None
+
+def get_scrape_jobs(limit=200):
+    """Returns the most recently queued jobs, newest first."""
+    rows = get_db_connection().execute("SELECT * FROM scrape_jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    return [_job_from_row(row) for row in rows]
+
+def count_scrape_jobs():
+    """Returns the number of jobs in each status, e.g. {'queued': 3, 'failed': 1}."""
+    rows = get_db_connection().execute("SELECT status, COUNT(*) AS n FROM scrape_jobs GROUP BY status")
+    return {row['status']: row['n'] for row in rows}
+
+def delete_scrape_job(job_id):
+    with transaction() as conn:
+        conn.execute("DELETE FROM scrape_jobs WHERE id = ?", (job_id,))
+
+def clear_finished_scrape_jobs():
+    """Deletes every done job."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM scrape_jobs WHERE status = ?", (JOB_DONE,))
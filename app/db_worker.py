@@ -0,0 +1,24 @@
+# app/db_worker.py
+
+from concurrent.futures import ThreadPoolExecutor
+from . import database
+
+class DatabaseWorker:
+    """
+    Runs the desktop app's database work on one dedicated thread, in the order it was submitted.
+
+    Connections are per thread, so the worker owns its own connection and the Tk thread
+    never touches SQLite: a slow query or a stalled disk delays the answer, not the window.
+    Work is submitted as a callable and comes back as a concurrent.futures.Future.
+    """
+    def __init__(self, name: str = "DatabaseWorker"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues fn(*args, **kwargs) to run on the worker thread and returns its Future."""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Finishes the work already submitted, so no save is lost, then closes the connection and stops."""
+        self._executor.submit(database.close_db_connection)
+        self._executor.shutdown(wait=wait)
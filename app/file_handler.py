@@ -1,14 +1,31 @@
 # app/file_handler.py
 
 import os
-import shutil
+import sqlite3
+import threading
 from tkinter import filedialog
+from . import database
 
-# This is the relative path from `main.py` to the database
-DATABASE_PATH = 'curators_vault.db'
+# Pages copied per step of the SQLite backup API. Between steps other connections
+# (the UI, the dashboard) get the database back, and progress is reported.
+BACKUP_PAGES_PER_STEP = 256
 
-def backup_database() -> tuple[bool, str]:
-    """Opens a 'save as' dialog and copies the current database to the selected path."""
+# Briefings are written through a buffer of this size and report progress every N posts.
+BRIEFING_BUFFER_SIZE = 1024 * 1024
+BRIEFING_PROGRESS_EVERY = 100
+
+def backup_database(on_progress=None, on_complete=None) -> tuple[bool, str]:
+    """
+    Opens a 'save as' dialog, then copies the live database to the selected path
+    on a worker thread using the SQLite backup API.
+
+    Args:
+        on_progress: Called as on_progress(pages_done, pages_total) from the worker thread.
+        on_complete: Called as on_complete(success, message) from the worker thread.
+
+    Returns:
+        (started, message) for the dialog step; the copy's outcome goes to on_complete.
+    """
     backup_path = filedialog.asksaveasfilename(
         defaultextension=".db",
         filetypes=[("Database files", "*.db")],
@@ -17,33 +34,123 @@ def backup_database() -> tuple[bool, str]:
     )
     if not backup_path:
         return False, "Backup cancelled."
-    
-    try:
-        shutil.copyfile(DATABASE_PATH, backup_path)
-        return True, f"Backup successful: {os.path.basename(backup_path)}"
-    except Exception as e:
-        return False, f"Backup failed: {e}"
 
-def restore_database() -> tuple[bool, str]:
-    """Opens a file dialog to select a backup and replaces the current database with it."""
+    _start_worker(lambda: write_backup(backup_path, on_progress), on_complete)
+    return True, f"Backing up to {os.path.basename(backup_path)}..."
+
+def restore_database(on_progress=None, on_complete=None) -> tuple[bool, str]:
+    """
+    Opens a file dialog to select a backup, then replaces the current database with it
+    on a worker thread. Callbacks work as in backup_database().
+    """
     backup_path = filedialog.askopenfilename(
         filetypes=[("Database files", "*.db")],
         title="Select Backup to Restore"
     )
     if not backup_path:
         return False, "Restore cancelled."
-        
+
+    _start_worker(lambda: restore_backup(backup_path, on_progress), on_complete)
+    return True, f"Restoring from {os.path.basename(backup_path)}..."
+
+def write_backup(backup_path: str, on_progress=None) -> tuple[bool, str]:
+    """
+    Copies the live database to backup_path while the app keeps running.
+    The copy is written next to the target, integrity-checked, and only then moved into
+    place, so a failed or interrupted backup never leaves a broken file at backup_path.
+    """
+    temp_path = f"{backup_path}.partial"
+    try:
+        target = sqlite3.connect(temp_path)
+        try:
+            database.get_db_connection().backup(
+                target, pages=BACKUP_PAGES_PER_STEP, progress=_progress_adapter(on_progress)
+            )
+            # A standalone rollback-journal file is easier to move around than one expecting a -wal sidecar.
+            target.execute("PRAGMA journal_mode = DELETE")
+            ok, detail = _integrity_check(target)
+        finally:
+            target.close()
+        if not ok:
+            os.remove(temp_path)
+            return False, f"Backup failed integrity check: {detail}"
+        os.replace(temp_path, backup_path)
+        return True, f"Backup successful: {os.path.basename(backup_path)}"
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False, f"Backup failed: {e}"
+
+def restore_backup(backup_path: str, on_progress=None) -> tuple[bool, str]:
+    """
+    Replaces the live database's contents with backup_path.
+
+    The backup is checked first. It is then written into the live database through
+    the backup API, which swaps the whole content in one transaction: readers,
+    including the dashboard, see either the old vault or the restored one, and the
+    WAL stays consistent, unlike copying a file over an open database.
+    """
     try:
-        shutil.copyfile(backup_path, DATABASE_PATH)
+        source = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+        try:
+            ok, detail = _integrity_check(source)
+            if not ok:
+                return False, f"Restore failed: backup is damaged ({detail})"
+            has_posts = source.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts'"
+            ).fetchone()
+            if not has_posts:
+                return False, "Restore failed: file is not a Curator's Vault database."
+            source.backup(
+                database.get_db_connection(), pages=BACKUP_PAGES_PER_STEP, progress=_progress_adapter(on_progress)
+            )
+        finally:
+            source.close()
+
+        # Other threads reopen their connections, and older backups are migrated to the current schema.
+        database.reset_connections()
+        database.init_db()
         return True, f"Restore successful from {os.path.basename(backup_path)}"
     except Exception as e:
         return False, f"Restore failed: {e}"
 
-def create_briefing(posts: list, search_term: str) -> tuple[bool, str]:
-    """Generates a markdown briefing from a list of posts and saves it to a file."""
-    if not posts:
-        return False, "No posts to create a briefing from."
+def _start_worker(task, on_complete):
+    """Runs task() on a daemon thread and passes its (success, message) to on_complete."""
+    def run():
+        try:
+            success, message = task()
+        finally:
+            database.close_db_connection()
+        if on_complete:
+            on_complete(success, message)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def _progress_adapter(on_progress):
+    """Turns sqlite3's progress(status, remaining, total) into on_progress(done, total)."""
+    if on_progress is None:
+        return None
+    return lambda status, remaining, total: on_progress(total - remaining, total)
+
+def _integrity_check(conn) -> tuple[bool, str]:
+    result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+    return result == "ok", result
 
+def create_briefing(search_term: str, on_progress=None, on_complete=None, cancel_event=None) -> tuple[bool, str]:
+    """
+    Opens a 'save as' dialog, then streams a markdown briefing of the posts matching
+    search_term to the selected file on a worker thread. Nothing is queried before
+    the dialog, so check there are posts to write (database.count_posts) first,
+    off the Tk thread.
+
+    Args:
+        on_progress: Called as on_progress(posts_written, posts_total) from the worker thread.
+        on_complete: Called as on_complete(success, message) from the worker thread.
+        cancel_event: A threading.Event; setting it stops the briefing and discards the file.
+
+    Returns:
+        (started, message) for the dialog step; the outcome goes to on_complete.
+    """
     file_path = filedialog.asksaveasfilename(
         defaultextension=".md",
         filetypes=[("Markdown", "*.md")],
@@ -52,19 +159,50 @@ def create_briefing(posts: list, search_term: str) -> tuple[bool, str]:
     if not file_path:
         return False, "Briefing save cancelled."
 
+    _start_worker(lambda: write_briefing(file_path, search_term, on_progress=on_progress, cancel_event=cancel_event), on_complete)
+    return True, f"Writing briefing to {os.path.basename(file_path)}..."
+
+def write_briefing(file_path: str, search_term: str = None, project_id: int = None,
+                   on_progress=None, cancel_event=None) -> tuple[bool, str]:
+    """
+    Writes a markdown briefing of the matching posts to file_path without a UI.
+    Posts are read from a database cursor and written through a buffered file one
+    entry at a time, so memory use doesn't grow with the number of posts. The file
+    appears at file_path only once it is complete.
+    """
+    total = database.count_posts(search_term, project_id)
+    if total == 0:
+        return False, "No posts to create a briefing from."
+
+    temp_path = f"{file_path}.partial"
     title = f"# X Briefing: {search_term}" if search_term else "# X Briefing: All Posts"
-    content = f"{title}\n\n"
-    
-    for post in posts:
-        content += f"## Post by: {post.get('author', 'N/A')}\n"
-        content += f"**URL:** {post.get('url', 'N/A')}\n\n"
-        content += f"### Text\n```\n{post.get('post_text', '')}\n```\n\n"
-        content += f"### Notes\n```\n{post.get('notes', '')}\n```\n\n"
-        content += "---\n\n"
-        
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        with open(temp_path, "w", encoding="utf-8", buffering=BRIEFING_BUFFER_SIZE) as f:
+            f.write(f"{title}\n\n")
+            written = 0
+            for post in database.iter_posts(search_term, project_id):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                f.write(_format_briefing_entry(post))
+                written += 1
+                if on_progress and (written % BRIEFING_PROGRESS_EVERY == 0 or written == total):
+                    on_progress(written, total)
+
+        if cancel_event is not None and cancel_event.is_set():
+            os.remove(temp_path)
+            return False, "Briefing cancelled."
+        os.replace(temp_path, file_path)
         return True, f"Briefing saved: {os.path.basename(file_path)}"
     except Exception as e:
-        return False, f"Failed to save briefing: {e}"
\ No newline at end of file
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False, f"Failed to save briefing: {e}"
+
+def _format_briefing_entry(post: dict) -> str:
+    return (
+        f"## Post by: {post.get('author') or 'N/A'}\n"
+        f"**URL:** {post.get('url') or 'N/A'}\n\n"
+        f"### Text\n```\n{post.get('post_text') or ''}\n```\n\n"
+        f"### Notes\n```\n{post.get('notes') or ''}\n```\n\n"
+        "---\n\n"
+    )
\ No newline at end of file
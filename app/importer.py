@@ -0,0 +1,100 @@
+# app/importer.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from . import database
+
+# The scraper's placeholder when a post has no text; such posts are not saved (see MainWindow.on_save_post).
+MISSING_TEXT = "Post content not found."
+
+def read_urls(lines) -> list[str]:
+    """
+    Collects post URLs from lines of text, e.g. an open file or sys.stdin.
+    Blank lines and lines starting with '#' are ignored, and duplicates are dropped.
+    """
+    urls = []
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith("#"):
+            urls.append(url)
+    return list(dict.fromkeys(urls))
+
+def post_record_from_scrape(url: str, data: dict, project_name=None, category_name=None) -> dict:
+    """Builds an add_posts_bulk() record from PostScraper.fetch_post_data() output."""
+    return {
+        # Same "Name (@handle)" format the detail form saves.
+        "author": f"{data['author_name']} ({data['author_handle']})",
+        "post_text": data["post_text"],
+        "notes": "",
+        "url": url,
+        "category_name": category_name,
+        "project_name": project_name,
+        "avatar_url": data.get("avatar_url"),
+        "resources": data.get("resources")
+    }
+
+def import_urls(urls, scraper, workers=4, batch_size=50, project_name=None, category_name=None, on_progress=None) -> dict:
+    """
+    Scrapes and saves many post URLs without the UI.
+
+    URLs already saved are skipped. The rest are scraped on `workers` threads, and
+    successful results are written with add_posts_bulk() every `batch_size` posts,
+    so each batch costs one transaction.
+
+    Args:
+        scraper: A PostScraper (or anything with a compatible fetch_post_data method).
+        on_progress: Called as on_progress(stats) after each URL finishes.
+
+    Returns:
+        A stats dict: total, skipped, scraped, saved, failed (a list of
+        (url, reason) pairs), elapsed (seconds) and rate (URLs scraped per second).
+    """
+    started = time.perf_counter()
+    urls = list(dict.fromkeys(urls))
+    existing = database.get_existing_urls(urls)
+    pending = [url for url in urls if url not in existing]
+    stats = {
+        "total": len(urls),
+        "skipped": len(urls) - len(pending),
+        "scraped": 0,
+        "saved": 0,
+        "failed": [],
+        "elapsed": 0.0,
+        "rate": 0.0
+    }
+
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        saved, errors = database.add_posts_bulk(record for _, record in batch)
+        stats["saved"] += saved
+        stats["failed"].extend((batch[index][0], f"Save failed: {message}") for index, message in errors)
+        batch.clear()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(scraper.fetch_post_data, url): url for url in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                stats["failed"].append((url, f"Scrape error: {e}"))
+            else:
+                if not data:
+                    stats["failed"].append((url, "Fetch failed. Post may be private or deleted."))
+                elif not data.get("post_text") or data["post_text"] == MISSING_TEXT:
+                    stats["failed"].append((url, "Post has no text."))
+                else:
+                    stats["scraped"] += 1
+                    batch.append((url, post_record_from_scrape(url, data, project_name, category_name)))
+                    if len(batch) >= batch_size:
+                        flush()
+            if on_progress:
+                on_progress(stats)
+    flush()
+
+    stats["elapsed"] = time.perf_counter() - started
+    stats["rate"] = stats["scraped"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    return stats
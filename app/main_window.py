@@ -1,27 +1,64 @@
 # app/main_window.py
 
 import customtkinter
+import queue
+import sqlite3
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from . import database
 from . import file_handler
-from .scraper import PostScraper
+from .db_worker import DatabaseWorker
+from .scrape_queue import ScrapeQueueWorker
 from .ui.post_list_frame import PostListFrame
 from .ui.post_detail_frame import PostDetailFrame
 from .ui.management_dialog import ManagementDialog
+from .ui.scrape_queue_dialog import ScrapeQueueDialog
+
+# How often the Tk thread picks up results handed over by worker threads (see call_soon).
+UI_POLL_MS = 20
 
 class MainWindow(customtkinter.CTkFrame):
     def __init__(self, master, assets):
         super().__init__(master)
         self.assets = assets
-        self.scraper = PostScraper()
+        # Created by get_scraper() when the first URL is scraped; importing Playwright is slow.
+        self.scraper = None
+        self.scraper_lock = threading.Lock()
 
         # --- Application State ---
         self.selected_post_id = None
         self.current_avatar_url = None
         # --- ADDED: State to hold the resource links from a scrape ---
         self.current_resources = None
-        self.is_fetching = False
         self.dialog = None
+        # --- Scrape queue: the job for the URL typed into the form, and the finished job shown in it ---
+        self.awaited_job_id = None
+        self.awaited_url = None
+        self.opened_job_id = None
+        self.queue_dialog = None
+        self.queue_refresh_pending = False
+        # --- Post list paging: the search shown and the cursor for its next page ---
+        self.post_list_search_term = None
+        self.post_list_cursor = None
+        # --- Names currently shown in the project/category comboboxes ---
+        self.project_names = None
+        self.category_names = None
+        self.status_clear_job = None
+        # Set while a briefing is being written; setting the event cancels it.
+        self.briefing_cancel_event = None
+        # --- Calls handed over by worker threads, run by the Tk thread in _run_ui_calls() ---
+        self.ui_calls = queue.SimpleQueue()
+        self.closing = False
+        # --- All other database work runs on the database worker; results come back through call_soon() ---
+        self.db_worker = DatabaseWorker()
+        # --- Search runs on its own worker thread, so a slow search can be interrupted without touching saves ---
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self.search_connection = None
+        # Bumped whenever the post list is given new contents; answers for an older list are dropped.
+        self.post_list_generation = 0
+        # --- Database changes waiting for the next idle moment: kind -> changed ids (None = unknown) ---
+        self.pending_changes = {}
+        self.pending_changes_lock = threading.Lock()
 
         # --- Main Layout ---
         self.grid_columnconfigure(0, weight=1, minsize=300)
@@ -32,19 +69,63 @@ class MainWindow(customtkinter.CTkFrame):
         self.post_list_frame = PostListFrame(self, self.assets)
         self.post_list_frame.grid(row=0, column=0, padx=(10, 5), pady=10, sticky="nsew")
 
-        self.post_detail_frame = PostDetailFrame(self, self.assets)
+        self.post_detail_frame = PostDetailFrame(self, self.assets, call_soon=self.call_soon)
         self.post_detail_frame.grid(row=0, column=1, padx=(5, 10), pady=10, sticky="nsew")
 
         self.status_bar = customtkinter.CTkLabel(self, text="Ready", anchor="w", font=self.assets.font_small)
         self.status_bar.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="ew")
 
         self._connect_callbacks()
+        self._run_ui_calls()
         self._load_initial_data()
+        self.unsubscribe_changes = database.subscribe_changes(self._on_database_changed)
+
+        # Job changes arrive on worker threads; hand them to the Tk thread.
+        self.scrape_queue = ScrapeQueueWorker(
+            self.get_scraper, on_change=lambda job_id: self.call_soon(self._on_scrape_job_changed, job_id)
+        )
+        # The queue can wait until the window is on screen.
+        self.after_idle(self._start_scrape_queue)
+
+    def call_soon(self, callback, *args):
+        """
+        Runs callback(*args) on the Tk thread. Safe to call from any thread, and it never
+        blocks: calling after() from a worker would wait for the Tk loop, which deadlocks
+        if the Tk thread is itself waiting for that worker (e.g. in shutdown()).
+        """
+        self.ui_calls.put((callback, args))
+
+    def _run_ui_calls(self):
+        while True:
+            try:
+                callback, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"UI update failed: {e}")
+        if not self.closing:
+            self.after(UI_POLL_MS, self._run_ui_calls)
+
+    def _start_scrape_queue(self):
+        self.scrape_queue.start()
+        self._schedule_queue_refresh()
+
+    def get_scraper(self):
+        """Returns the scraper, creating it (and importing the browser code) on first use. Thread-safe."""
+        with self.scraper_lock:
+            if self.scraper is None:
+                from .scraper import PostScraper
+                self.scraper = PostScraper()
+            return self.scraper
 
     def _connect_callbacks(self):
         self.post_list_frame.connect_callbacks(
             post_selected=self.on_post_selected,
-            create_briefing=self.on_create_briefing
+            create_briefing=self.on_create_briefing,
+            load_more=self.on_load_more_posts,
+            search=self.on_search
         )
         self.post_detail_frame.connect_callbacks(
             save=self.on_save_post,
@@ -55,7 +136,8 @@ class MainWindow(customtkinter.CTkFrame):
             backup=self.on_backup_database,
             restore=self.on_restore_database,
             manage_projects=self.on_manage_projects,
-            manage_categories=self.on_manage_categories
+            manage_categories=self.on_manage_categories,
+            queue=self.on_open_queue
         )
 
     def _load_initial_data(self):
@@ -64,24 +146,150 @@ class MainWindow(customtkinter.CTkFrame):
         self.refresh_post_list()
         self.on_new_post()
 
+    def _on_database_changed(self, kind, ids):
+        """
+        Hears about every committed change, on the thread that made it. Changes are
+        collected until Tk is next idle and then applied together, so a save that adds
+        a post, a project and a category refreshes each affected view once.
+        """
+        with self.pending_changes_lock:
+            first = not self.pending_changes
+            if kind in self.pending_changes:
+                known = self.pending_changes[kind]
+                self.pending_changes[kind] = None if known is None or ids is None else known | ids
+            else:
+                self.pending_changes[kind] = ids
+        if first:
+            self.call_soon(self.after_idle, self._apply_database_changes)
+
+    def _apply_database_changes(self):
+        with self.pending_changes_lock:
+            changes, self.pending_changes = self.pending_changes, {}
+        if database.PROJECTS_CHANGED in changes:
+            self.refresh_projects()
+        if database.CATEGORIES_CHANGED in changes:
+            self.refresh_categories()
+        if database.POSTS_CHANGED in changes:
+            self.refresh_changed_posts(changes[database.POSTS_CHANGED])
+
+    def refresh_changed_posts(self, post_ids):
+        """
+        Brings the post list and the open post up to date after posts changed. With the ids
+        known and no search showing, only those posts are re-read and merged into the loaded
+        rows; otherwise the loaded list is re-read whole. The open post is re-read only if it
+        may have changed, and the form cleared if it was deleted.
+        """
+        open_post_id = self.selected_post_id
+        if post_ids is not None and open_post_id not in post_ids:
+            open_post_id = None  # Not among the changes; leave the form alone.
+        if post_ids is None or self.post_list_search_term:
+            # Unknown rows, or search results whose ranking the change may have reshuffled.
+            self.reload_post_list()
+            generation, read_ids = None, {open_post_id} - {None}
+        else:
+            generation, read_ids = self.post_list_generation, set(post_ids)
+        if not read_ids:
+            return
+        self._run_db(
+            lambda: database.get_posts_by_ids(read_ids),
+            lambda posts: self._show_changed_posts(generation, read_ids, open_post_id, posts)
+        )
+
+    def _show_changed_posts(self, generation, post_ids, open_post_id, posts):
+        # A list loaded since then (a search, a reload) already has these posts as they are now.
+        if generation is not None and generation == self.post_list_generation:
+            self.post_list_frame.update_posts(
+                self._merge_changed_posts(post_ids, posts), has_more=self.post_list_cursor is not None
+            )
+        if open_post_id is not None and open_post_id == self.selected_post_id:
+            post = next((post for post in posts if post['id'] == open_post_id), None)
+            if post is None:
+                self.on_new_post()  # Deleted.
+            else:
+                self.current_avatar_url = post.get('avatar_url')
+                self.current_resources = post.get('resources')
+                self.post_detail_frame.populate_form(post)
+
+    def _merge_changed_posts(self, post_ids, posts):
+        """Returns the loaded posts with the changed ones replaced, removed or added in newest-first order."""
+        loaded = self.post_list_frame.posts_data
+        merged = [post for post in loaded if post['id'] not in post_ids]
+        if self.post_list_cursor is not None and loaded:
+            # Posts older than the last loaded one belong to a page that isn't loaded yet.
+            last = (loaded[-1]['created_at'], loaded[-1]['id'])
+            posts = [post for post in posts if (post['created_at'], post['id']) > last]
+        merged.extend(posts)
+        merged.sort(key=lambda post: (post['created_at'], post['id']), reverse=True)
+        return merged
+
+    def _run_db(self, task, on_done=None, controls=None, error_message="Database error"):
+        """
+        Runs task() on the database worker and then on_done(result) on the Tk thread.
+
+        Args:
+            controls: A set_state(state) function, e.g. for the action buttons. The controls
+                are disabled until the request finishes, so it can't be sent twice.
+            error_message: Prefix for the status bar message if task() raises.
+        """
+        if controls:
+            controls("disabled")
+        future = self.db_worker.submit(task)
+        future.add_done_callback(
+            lambda done: self.call_soon(self._finish_db_request, done, on_done, controls, error_message)
+        )
+        return future
+
+    def _finish_db_request(self, future, on_done, controls, error_message):
+        if controls:
+            controls("normal")
+        try:
+            result = future.result()
+        except Exception as e:
+            self.update_status(f"{error_message}: {e}", is_error=True)
+            return
+        if on_done:
+            on_done(result)
+
     # --- CONTROLLER LOGIC (HANDLERS FOR UI EVENTS) ---
 
     def on_post_selected(self, post_data, search_term):
-        if post_data:
-            self.selected_post_id = post_data['id']
-            self.current_avatar_url = post_data.get('avatar_url')
-            # --- MODIFIED: Store the resources from the selected post ---
-            self.current_resources = post_data.get('resources')
-            self.post_detail_frame.populate_form(post_data)
-            self.update_status(f"Viewing Post ID: {self.selected_post_id}")
-        else:
-            self.refresh_post_list(search_term)
+        self.selected_post_id = post_data['id']
+        self.current_avatar_url = post_data.get('avatar_url')
+        # --- MODIFIED: Store the resources from the selected post ---
+        self.current_resources = post_data.get('resources')
+        self.post_detail_frame.populate_form(post_data)
+        self.update_status(f"Viewing Post ID: {self.selected_post_id}")
+
+    def on_search(self, search_term):
+        """Runs a search on the search worker; the list updates when it finishes, unless a newer search has started."""
+        self.post_list_generation += 1
+        # A query still running for an older term is pointless now. interrupt() does nothing if none is running.
+        conn = self.search_connection
+        if conn is not None:
+            conn.interrupt()
+        self.search_executor.submit(self._run_search, self.post_list_generation, search_term or None)
+
+    def _run_search(self, generation, search_term):
+        # Runs on the search worker thread.
+        if generation != self.post_list_generation:
+            return  # Superseded while waiting for the worker.
+        self.search_connection = database.get_db_connection()
+        try:
+            posts, cursor = database.get_posts_page(search_term)
+        except sqlite3.OperationalError as e:
+            if generation == self.post_list_generation:
+                self.call_soon(self.update_status, f"Search failed: {e}", True)
+            return
+        self.call_soon(self._show_post_list, generation, search_term, (posts, cursor))
 
     def on_new_post(self):
         self.selected_post_id = None
         self.current_avatar_url = None
         # --- ADDED: Clear the resources when starting a new post ---
         self.current_resources = None
+        self.awaited_job_id = None
+        self.awaited_url = None
+        self.opened_job_id = None
         self.post_list_frame.clear_selection()
         self.post_detail_frame.clear_form()
         self.update_status("Ready to create a new post.")
@@ -92,17 +300,27 @@ class MainWindow(customtkinter.CTkFrame):
             self.update_status("Cannot save post with no content.", is_error=True)
             return
         
-        # --- MODIFIED: Pass the stored resources to the database function ---
-        database.add_post(
-            data["author"], data["post_text"], data["notes"], data["url"], 
-            data["category_name"], data["project_name"], self.current_avatar_url,
-            self.current_resources
-        )
-        
+        avatar_url, resources, opened_job_id = self.current_avatar_url, self.current_resources, self.opened_job_id
+
+        def save():
+            # --- MODIFIED: Pass the stored resources to the database function ---
+            database.add_post(
+                data["author"], data["post_text"], data["notes"], data["url"],
+                data["category_name"], data["project_name"], avatar_url, resources
+            )
+            if opened_job_id is not None:
+                # The scraped post is in the vault now; its finished job has served its purpose.
+                database.delete_scrape_job(opened_job_id)
+
+        self.update_status("Saving post...", persist=True)
+        self._run_db(save, lambda _: self._on_post_saved(opened_job_id),
+                     controls=self.post_detail_frame.set_actions_state, error_message="Save failed")
+
+    def _on_post_saved(self, opened_job_id):
+        # The list and menus update themselves from the change notifications.
+        if opened_job_id is not None:
+            self._schedule_queue_refresh()
         self.update_status("Post saved successfully.")
-        self.refresh_projects()
-        self.refresh_categories()
-        self.refresh_post_list()
         self.on_new_post()
 
     def on_update_post(self):
@@ -111,52 +329,215 @@ class MainWindow(customtkinter.CTkFrame):
             return
             
         data = self.post_detail_frame.get_form_data()
+        post_id, avatar_url, resources = self.selected_post_id, self.current_avatar_url, self.current_resources
         # --- MODIFIED: Pass the stored resources to the database function ---
-        database.update_post(
-            self.selected_post_id, data["author"], data["post_text"], data["notes"], 
-            data["url"], data["category_name"], data["project_name"], self.current_avatar_url,
-            self.current_resources
+        self._run_db(
+            lambda: database.update_post(
+                post_id, data["author"], data["post_text"], data["notes"],
+                data["url"], data["category_name"], data["project_name"], avatar_url, resources
+            ),
+            lambda _: self._on_post_updated(post_id),
+            controls=self.post_detail_frame.set_actions_state,
+            error_message="Update failed"
         )
-        
-        self.update_status(f"Post ID {self.selected_post_id} updated.")
-        self.refresh_projects()
-        self.refresh_categories()
-        self.refresh_post_list()
+
+    def _on_post_updated(self, post_id):
+        self.update_status(f"Post ID {post_id} updated.")
 
     def on_delete_post(self):
         if self.selected_post_id is None:
             self.update_status("Error: No post selected to delete.", is_error=True)
             return
             
-        database.delete_post(self.selected_post_id)
-        self.update_status(f"Post ID {self.selected_post_id} deleted.")
-        self.refresh_post_list()
-        self.on_new_post()
+        post_id = self.selected_post_id
+        self._run_db(
+            lambda: database.delete_post(post_id),
+            lambda _: self._on_post_deleted(post_id),
+            controls=self.post_detail_frame.set_actions_state,
+            error_message="Delete failed"
+        )
+
+    def _on_post_deleted(self, post_id):
+        self.update_status(f"Post ID {post_id} deleted.")
+        # The form may show another post by now; only clear it if it still shows the deleted one.
+        if self.selected_post_id == post_id:
+            self.on_new_post()
 
     def on_fetch_url(self, url):
-        if self.is_fetching:
+        # Pasting or entering the same URL again lands here too; only a new URL needs a job.
+        if url == self.awaited_url:
             return
-        self.is_fetching = True
-        self.update_status("Fetching post details...")
-        self.post_detail_frame.set_url_entry_state("disabled")
-        
-        thread = threading.Thread(target=self._scrape_post_thread, args=(url,))
-        thread.daemon = True
-        thread.start()
+        self.awaited_url = url
+        self.awaited_job_id = None
+        self.update_status("Fetching post details...", persist=True)
+        self._run_db(lambda: self.scrape_queue.enqueue([url])[0], lambda job_id: self._on_fetch_queued(url, job_id))
+
+    def _on_fetch_queued(self, url, job_id):
+        if url != self.awaited_url:
+            return  # Another URL was entered meanwhile.
+        self.awaited_job_id = job_id
+        self._schedule_queue_refresh()
+        # The job may have finished already (e.g. from the scrape cache) before we knew its id.
+        self._on_scrape_job_changed(job_id)
+
+    def _on_scrape_job_changed(self, job_id):
+        self._schedule_queue_refresh()
+        if job_id == self.awaited_job_id:
+            self._run_db(lambda: database.get_scrape_job(job_id), lambda job: self._on_awaited_job_loaded(job_id, job))
+
+    def _on_awaited_job_loaded(self, job_id, job):
+        if job_id != self.awaited_job_id:
+            return
+        if job is None:
+            # Removed from the queue; entering the URL again queues it anew.
+            self.awaited_job_id = None
+            self.awaited_url = None
+            self.update_status("Fetch cancelled: the job was removed from the queue.")
+        elif job['status'] == database.JOB_DONE:
+            self.awaited_job_id = None
+            self.opened_job_id = job_id
+            self._populate_scraped_data(job['result'])
+        elif job['status'] == database.JOB_FAILED:
+            # Out of attempts. Clearing the URL lets Return or a paste in the URL field try again.
+            self.awaited_job_id = None
+            self.awaited_url = None
+            self.update_status(f"Fetch failed: {job['last_error']}", is_error=True)
+        elif job['status'] == database.JOB_QUEUED and job['last_error']:
+            self.update_status(
+                f"Fetch failed ({job['last_error']}); retrying, attempt {job['attempts'] + 1} of {job['max_attempts']}...",
+                is_error=True, persist=True
+            )
+
+    # --- Scrape queue window ---
+
+    def on_open_queue(self):
+        if self.queue_dialog is not None and self.queue_dialog.winfo_exists():
+            self.queue_dialog.focus()
+            return
+        self.queue_dialog = ScrapeQueueDialog(
+            self, self.assets,
+            enqueue_callback=self.on_enqueue_urls,
+            open_callback=self.on_open_scrape_job,
+            retry_callback=self.on_retry_scrape_job,
+            remove_callback=self.on_remove_scrape_job,
+            clear_finished_callback=self.on_clear_finished_jobs
+        )
+        self._refresh_queue_view()
+
+    def on_enqueue_urls(self, urls):
+        self._run_db(lambda: self.scrape_queue.enqueue(urls), self._on_urls_queued)
+
+    def _on_urls_queued(self, job_ids):
+        self.update_status(f"Queued {len(job_ids)} URL(s) for fetching.")
+        self._schedule_queue_refresh()
+
+    def on_open_scrape_job(self, job):
+        """Shows a finished job's post in the form as a new post, ready to save."""
+        self.on_new_post()
+        self.awaited_url = job['url']
+        self.opened_job_id = job['id']
+        self.post_detail_frame.set_url(job['url'])
+        self._populate_scraped_data(job['result'])
+
+    def on_retry_scrape_job(self, job_id):
+        def retry():
+            database.retry_scrape_job(job_id)
+            self.scrape_queue.wake()
+        self._run_db(retry, lambda _: self._schedule_queue_refresh())
+
+    def on_remove_scrape_job(self, job_id):
+        self._run_db(lambda: database.delete_scrape_job(job_id), lambda _: self._schedule_queue_refresh())
+
+    def on_clear_finished_jobs(self):
+        self._run_db(database.clear_finished_scrape_jobs, lambda _: self._schedule_queue_refresh())
+
+    def _schedule_queue_refresh(self):
+        # A busy queue changes many times a second; redraw at most every 250 ms.
+        if not self.queue_refresh_pending:
+            self.queue_refresh_pending = True
+            self.after(250, self._refresh_queue_view)
+
+    def _refresh_queue_view(self):
+        self.queue_refresh_pending = False
+        dialog_open = self.queue_dialog is not None and self.queue_dialog.winfo_exists()
+        self._run_db(
+            lambda: (database.count_scrape_jobs(), database.get_scrape_jobs() if dialog_open else None),
+            self._show_queue
+        )
+
+    def _show_queue(self, result):
+        counts, jobs = result
+        self.post_detail_frame.set_queue_count(counts.get(database.JOB_QUEUED, 0) + counts.get(database.JOB_RUNNING, 0))
+        if jobs is not None and self.queue_dialog is not None and self.queue_dialog.winfo_exists():
+            self.queue_dialog.refresh(jobs, counts)
 
     def on_backup_database(self):
-        success, message = file_handler.backup_database()
-        self.update_status(message, is_error=not success)
+        # The copy runs on a worker thread; its callbacks are handed back to the Tk thread.
+        success, message = file_handler.backup_database(
+            on_progress=lambda done, total: self.call_soon(self._show_copy_progress, "Backing up", done, total),
+            on_complete=lambda ok, msg: self.call_soon(self._on_database_copy_finished, ok, msg, False)
+        )
+        self._set_database_buttons_state("disabled" if success else "normal")
+        self.update_status(message, is_error=not success, persist=success)
 
     def on_restore_database(self):
-        success, message = file_handler.restore_database()
+        success, message = file_handler.restore_database(
+            on_progress=lambda done, total: self.call_soon(self._show_copy_progress, "Restoring", done, total),
+            on_complete=lambda ok, msg: self.call_soon(self._on_database_copy_finished, ok, msg, True)
+        )
+        self._set_database_buttons_state("disabled" if success else "normal")
+        self.update_status(message, is_error=not success, persist=success)
+
+    def _show_copy_progress(self, action, done, total):
+        percent = int(done * 100 / total) if total else 100
+        self.update_status(f"{action}... {percent}%", persist=True)
+
+    def _on_database_copy_finished(self, success, message, reload_data):
+        self._set_database_buttons_state("normal")
         self.update_status(message, is_error=not success)
-        if success:
+        if success and reload_data:
             self._load_initial_data()
 
+    def _set_database_buttons_state(self, state):
+        self.post_detail_frame.set_database_buttons_state(state)
+
     def on_create_briefing(self, search_term):
-        posts = database.get_all_posts(search_term)
-        success, message = file_handler.create_briefing(posts, search_term)
+        # While a briefing is running, the same button cancels it.
+        if self.briefing_cancel_event is not None:
+            self.briefing_cancel_event.set()
+            self.update_status("Cancelling briefing...", persist=True)
+            return
+
+        # Only ask for a file name if there is something to write.
+        self._run_db(
+            lambda: database.count_posts(search_term),
+            lambda total: self._start_briefing(search_term, total),
+            controls=self.post_list_frame.set_briefing_state
+        )
+
+    def _start_briefing(self, search_term, total):
+        if total == 0:
+            self.update_status("No posts to create a briefing from.", is_error=True)
+            return
+        cancel_event = threading.Event()
+        success, message = file_handler.create_briefing(
+            search_term,
+            on_progress=lambda done, total: self.call_soon(self._show_briefing_progress, done, total),
+            on_complete=lambda ok, msg: self.call_soon(self._on_briefing_finished, ok, msg),
+            cancel_event=cancel_event
+        )
+        if success:
+            self.briefing_cancel_event = cancel_event
+            self.post_list_frame.set_briefing_running(True)
+        self.update_status(message, is_error=not success, persist=success)
+
+    def _show_briefing_progress(self, done, total):
+        if self.briefing_cancel_event is not None and not self.briefing_cancel_event.is_set():
+            self.update_status(f"Writing briefing... {done}/{total} posts", persist=True)
+
+    def _on_briefing_finished(self, success, message):
+        self.briefing_cancel_event = None
+        self.post_list_frame.set_briefing_running(False)
         self.update_status(message, is_error=not success)
 
     def on_manage_projects(self):
@@ -164,7 +545,11 @@ class MainWindow(customtkinter.CTkFrame):
             self.dialog.focus()
             return
         
-        projects = database.get_all_projects()
+        self._run_db(database.get_all_projects, self._open_projects_dialog)
+
+    def _open_projects_dialog(self, projects):
+        if self.dialog is not None and self.dialog.winfo_exists():
+            return
         self.dialog = ManagementDialog(self, "Manage Projects", projects, self.delete_project)
 
     def on_manage_categories(self):
@@ -172,48 +557,127 @@ class MainWindow(customtkinter.CTkFrame):
             self.dialog.focus()
             return
             
-        categories = database.get_all_categories()
+        self._run_db(database.get_all_categories, self._open_categories_dialog)
+
+    def _open_categories_dialog(self, categories):
+        if self.dialog is not None and self.dialog.winfo_exists():
+            return
         self.dialog = ManagementDialog(self, "Manage Categories", categories, self.delete_category)
 
     def delete_project(self, project_id):
-        database.delete_project(project_id)
+        self._run_db(lambda: database.delete_project(project_id), self._on_project_deleted)
+
+    def _on_project_deleted(self, _):
         self.update_status("Project deleted successfully.")
-        self.refresh_projects()
-        self.refresh_post_list()
 
     def delete_category(self, category_id):
-        database.delete_category(category_id)
+        self._run_db(lambda: database.delete_category(category_id), self._on_category_deleted)
+
+    def _on_category_deleted(self, _):
         self.update_status("Category deleted successfully.")
-        self.refresh_categories()
-        self.refresh_post_list()
 
     def refresh_post_list(self, search_term=None):
-        posts = database.get_all_posts(search_term)
-        self.post_list_frame.refresh_post_list(posts)
+        # Results of a search still in flight would overwrite this list; discard them.
+        self.post_list_generation += 1
+        generation = self.post_list_generation
+        self._run_db(
+            lambda: database.get_posts_page(search_term),
+            lambda page: self._show_post_list(generation, search_term, page)
+        )
+
+    def _show_post_list(self, generation, search_term, page):
+        if generation != self.post_list_generation:
+            return
+        posts, self.post_list_cursor = page
+        self.post_list_search_term = search_term
+        self.post_list_frame.refresh_post_list(posts, has_more=self.post_list_cursor is not None)
+
+    def reload_post_list(self):
+        """
+        Re-reads the posts the list is showing (same search, as many rows as are loaded)
+        and hands them over as a diff, so an edit only redraws the rows it changed and
+        the list stays scrolled where it was.
+        """
+        generation, search_term = self.post_list_generation, self.post_list_search_term
+        loaded = max(database.PAGE_SIZE, len(self.post_list_frame.posts_data))
+        self._run_db(
+            lambda: database.get_posts_page(search_term, limit=loaded),
+            lambda page: self._update_post_list(generation, search_term, page)
+        )
+
+    def _update_post_list(self, generation, search_term, page):
+        # A search that finished in the meantime shows other posts; this reload is for the old ones.
+        if generation != self.post_list_generation or search_term != self.post_list_search_term:
+            return
+        posts, self.post_list_cursor = page
+        self.post_list_frame.update_posts(posts, has_more=self.post_list_cursor is not None)
+
+    def on_load_more_posts(self):
+        if self.post_list_cursor is None:
+            return
+        generation, search_term, cursor = self.post_list_generation, self.post_list_search_term, self.post_list_cursor
+        self._run_db(
+            lambda: database.get_posts_page(search_term, cursor=cursor),
+            lambda page: self._append_post_list(generation, search_term, cursor, page)
+        )
+
+    def _append_post_list(self, generation, search_term, cursor, page):
+        if (generation != self.post_list_generation or search_term != self.post_list_search_term
+                or cursor != self.post_list_cursor):
+            return
+        posts, self.post_list_cursor = page
+        self.post_list_frame.append_posts(posts, has_more=self.post_list_cursor is not None)
 
     def refresh_projects(self):
-        projects = database.get_all_projects()
-        project_names = [p['name'] for p in projects]
-        self.post_detail_frame.update_project_menu(project_names)
+        # Names come from the database lookup cache; only touch the combobox if they changed.
+        self._run_db(database.get_project_names, self._show_project_names)
+
+    def _show_project_names(self, project_names):
+        if project_names != self.project_names:
+            self.project_names = project_names
+            self.post_detail_frame.update_project_menu(project_names)
 
     def refresh_categories(self):
-        categories = database.get_all_categories()
-        category_names = [cat['name'] for cat in categories]
-        self.post_detail_frame.update_category_menu(category_names)
+        self._run_db(database.get_category_names, self._show_category_names)
 
-    def update_status(self, message, is_error=False):
+    def _show_category_names(self, category_names):
+        if category_names != self.category_names:
+            self.category_names = category_names
+            self.post_detail_frame.update_category_menu(category_names)
+
+    def update_status(self, message, is_error=False, persist=False):
+        """Shows a message in the status bar. It clears after 4 seconds unless `persist` is set."""
         color = "#D32F2F" if is_error else "#DCE4EE"
         self.status_bar.configure(text=message, text_color=color)
-        self.status_bar.after(4000, lambda: self.status_bar.configure(text=""))
+        # A newer message replaces the old one's timer, so it isn't wiped early.
+        if self.status_clear_job is not None:
+            self.status_bar.after_cancel(self.status_clear_job)
+            self.status_clear_job = None
+        if not persist:
+            self.status_clear_job = self.status_bar.after(4000, self._clear_status)
 
-    def _scrape_post_thread(self, url):
-        scraped_data = self.scraper.fetch_post_data(url)
-        self.after(0, self._populate_scraped_data, scraped_data)
+    def _clear_status(self):
+        self.status_clear_job = None
+        self.status_bar.configure(text="")
 
-    def _populate_scraped_data(self, data):
-        self.is_fetching = False
-        self.post_detail_frame.set_url_entry_state("normal")
+    def shutdown(self):
+        """Stops background work before the window closes: cancels a running briefing, stops the scrape queue and closes the scraper's browser."""
+        # From here on, results from workers are left unread; nothing waits for the Tk loop.
+        self.closing = True
+        if self.briefing_cancel_event is not None:
+            self.briefing_cancel_event.set()
+        self.unsubscribe_changes()
+        self.search_executor.shutdown(wait=False, cancel_futures=True)
+        self.assets.image_executor.shutdown(wait=False, cancel_futures=True)
+        # Unfinished jobs stay in the database and resume next time.
+        self.scrape_queue.stop()
+        # Let a save that is still being written finish before the window goes.
+        self.db_worker.shutdown()
+        with self.scraper_lock:
+            if self.scraper is not None:
+                self.scraper.close(timeout=5.0)
 
+    def _populate_scraped_data(self, data):
         if data:
             self.current_avatar_url = data.get("avatar_url")
             # --- ADDED: Store the scraped resources in our state variable ---
@@ -0,0 +1,131 @@
+# app/resources.py
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+from . import database
+
+# Regex to find URLs. It's a bit broad to catch various URL formats.
+URL_PATTERN = re.compile(r'https?://[^\s/$.?#].[^\s]*')
+
+# Hosts whose links are worth keeping. Subdomains count too, so 'github.com' also
+# covers gist.github.com and www.github.com.
+RESOURCE_DOMAINS = frozenset({
+    'github.com',
+    'huggingface.co',
+    'arxiv.org',
+    'colab.research.google.com',
+})
+
+def extract_resources(text: str, domains=RESOURCE_DOMAINS) -> str | None:
+    """
+    Finds valuable resource links within post text.
+
+    Args:
+        text: The full text of the post.
+        domains: Hosts to keep links to (a set, so lookups stay cheap however many there are).
+
+    Returns:
+        A JSON string of found URLs, or None if none are found.
+    """
+    resource_links = []
+    for url in URL_PATTERN.findall(text or ""):
+        # Clean up potential trailing characters that aren't part of the URL
+        cleaned_url = url.rstrip('.,)!"\'')
+        try:
+            host = urlsplit(cleaned_url).hostname
+        except ValueError:
+            # e.g. "https://[fe80::1" is an unclosed IPv6 host; it can't be a resource link.
+            continue
+        if _is_resource_host(host, domains):
+            resource_links.append(cleaned_url)
+
+    if not resource_links:
+        return None
+
+    # Return a JSON string for easy storage in the database; duplicates are dropped, first mention first.
+    return json.dumps(list(dict.fromkeys(resource_links)))
+
+def _is_resource_host(host, domains) -> bool:
+    """True if host or any parent domain of it is in domains."""
+    if not host:
+        return False
+    labels = host.lower().split('.')
+    return any('.'.join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+# --- Backfill ---
+# Posts saved before the resources column existed, or edited by hand since, can be
+# missing links. backfill_resources() re-extracts them for the whole vault.
+
+BACKFILL_PROGRESS_KEY = "resources_backfill_last_id"
+BACKFILL_CHUNK_SIZE = 2000
+
+def _extract_chunk(rows, domains):
+    """Process pool task: [(post_id, post_text, old_resources)] -> [(post_id, resources)] for the posts that changed."""
+    changed = []
+    for post_id, post_text, old_resources in rows:
+        resources = extract_resources(post_text, domains)
+        if _link_set(resources) != _link_set(old_resources):
+            changed.append((post_id, resources))
+    return changed
+
+def _link_set(resources):
+    try:
+        return frozenset(json.loads(resources)) if resources else frozenset()
+    except (TypeError, ValueError):
+        return None
+
+def backfill_resources(chunk_size=BACKFILL_CHUNK_SIZE, workers=None, domains=RESOURCE_DOMAINS,
+                       restart=False, on_progress=None) -> dict:
+    """
+    Re-extracts resources for every post and saves the ones that changed.
+
+    Posts are read in id order, chunk_size at a time. Each chunk is split across a
+    pool of `workers` processes (default: one per CPU; 1 runs in this process),
+    and its changes are written in one transaction together with the id of the
+    chunk's last post. If the run is interrupted, the next one resumes after that
+    post instead of starting over. Once the whole vault is done the bookmark is
+    cleared, so the next run starts from the beginning again.
+
+    Args:
+        restart: Ignore a saved bookmark and start from the first post.
+        on_progress: Called as on_progress(posts_done, posts_total) after each chunk.
+
+    Returns:
+        A stats dict: resumed_from (post id, 0 for a fresh run), scanned and updated.
+    """
+    if restart:
+        database.set_state(BACKFILL_PROGRESS_KEY, None)
+    last_id = int(database.get_state(BACKFILL_PROGRESS_KEY) or 0)
+    stats = {"resumed_from": last_id, "scanned": 0, "updated": 0}
+    total = database.count_posts_after(last_id)
+    workers = workers or os.cpu_count() or 1
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while True:
+            rows = database.get_post_texts_after(last_id, chunk_size)
+            if not rows:
+                break
+            rows = [(row['id'], row['post_text'], row['resources']) for row in rows]
+            if pool is None:
+                changed = _extract_chunk(rows, domains)
+            else:
+                step = -(-len(rows) // workers)
+                parts = [rows[i:i + step] for i in range(0, len(rows), step)]
+                changed = [update for part in pool.map(_extract_chunk, parts, [domains] * len(parts)) for update in part]
+
+            last_id = rows[-1][0]
+            database.update_resources_batch(changed, BACKFILL_PROGRESS_KEY, last_id)
+            stats["scanned"] += len(rows)
+            stats["updated"] += len(changed)
+            if on_progress:
+                on_progress(stats["scanned"], total)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    database.set_state(BACKFILL_PROGRESS_KEY, None)
+    return stats
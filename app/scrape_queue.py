@@ -0,0 +1,164 @@
+# app/scrape_queue.py
+
+import queue
+import sqlite3
+import threading
+import time
+from . import database
+
+# Seconds before the first retry of a failed job; each further retry waits twice as long, up to the cap.
+RETRY_BASE_DELAY = 30
+RETRY_MAX_DELAY = 15 * 60
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a job that has failed `attempts` times."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+class ScrapeQueueWorker:
+    """
+    Drains the scrape_jobs table in the background.
+
+    A dispatcher thread claims due jobs and hands them to the scraper, keeping up
+    to `concurrency` of them in flight. Each job's outcome is written back to the
+    table: its result, or the error and a retry time with exponential backoff.
+    Because the queue lives in the database, jobs queued or interrupted when the
+    app closed are picked up again by the next worker.
+
+    Args:
+        get_scraper: Returns the PostScraper to submit jobs to. It is only called once there is
+            a job to run, so an idle queue doesn't import or start the browser. Jobs are submitted
+            with raise_errors so the real failure reason is recorded.
+        on_change: Called as on_change(job_id) from a worker thread whenever a job changes state.
+    """
+    def __init__(self, get_scraper, concurrency: int = 2, poll_interval: float = 5.0, on_change=None):
+        self.get_scraper = get_scraper
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+
+        self._wake = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # (job, future) pairs the scraper has finished, waiting for the dispatcher to record them.
+        self._finished = queue.SimpleQueue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ScrapeQueueWorker")
+        self._thread.start()
+        return self
+
+    def enqueue(self, urls) -> list[int]:
+        """Queues URLs (see database.enqueue_scrape_jobs) and wakes the worker. Returns the job ids."""
+        job_ids = database.enqueue_scrape_jobs(urls)
+        self.wake()
+        return job_ids
+
+    def wake(self):
+        """Makes the worker look for due jobs now rather than at its next poll."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        """Stops claiming jobs. Jobs still in flight are left running and requeued by the next start()."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        requeued = False
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                try:
+                    if not requeued:
+                        # Jobs left running belong to a worker that is gone; they would otherwise never finish.
+                        database.requeue_running_scrape_jobs()
+                        requeued = True
+                    self._record_finished_jobs()
+                    self._dispatch_due_jobs()
+                    timeout = self._seconds_until_next_job()
+                except sqlite3.Error as e:
+                    # Usually "database is locked" past the busy timeout. The queue is all in the
+                    # database, so nothing is lost by trying again at the next poll.
+                    print(f"Scrape queue: database error, retrying: {e}")
+                    timeout = self.poll_interval
+                self._wake.wait(timeout)
+        finally:
+            database.close_db_connection()
+
+    def _dispatch_due_jobs(self):
+        while not self._stopping:
+            with self._lock:
+                if self._in_flight >= self.concurrency:
+                    return
+            job = database.claim_scrape_job()
+            if job is None:
+                return
+            with self._lock:
+                self._in_flight += 1
+            self._notify(job['id'])
+            try:
+                future = self.get_scraper().submit(job['url'], raise_errors=True)
+            except Exception as e:
+                # E.g. Playwright isn't installed, or the scrape cache was locked. The job
+                # is failed like any other scrape, so it is retried with backoff.
+                with self._lock:
+                    self._in_flight -= 1
+                database.fail_scrape_job(job['id'], f"Could not start the scrape: {e}", retry_delay(job['attempts']))
+                self._notify(job['id'])
+                continue
+            future.add_done_callback(lambda done, job=job: self._finish(job, done))
+
+    def _seconds_until_next_job(self) -> float:
+        with self._lock:
+            if self._in_flight >= self.concurrency:
+                # Due jobs have to wait for a free slot; _finish() wakes us when one opens.
+                return self.poll_interval
+        due_at = database.next_scrape_job_due_at()
+        if due_at is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, due_at - time.time()))
+
+    def _finish(self, job: dict, future):
+        # Runs on the scraper's event loop thread, which must not wait on the database,
+        # so the outcome is only handed over to the dispatcher thread.
+        self._finished.put((job, future))
+        self._wake.set()
+
+    def _record_finished_jobs(self):
+        while True:
+            try:
+                job, future = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            # While stopping, in-flight jobs are left for the next start().
+            if not self._stopping:
+                try:
+                    self._record(job, future)
+                except sqlite3.Error:
+                    # Kept for the next attempt; _run() reports the error.
+                    self._finished.put((job, future))
+                    raise
+            with self._lock:
+                self._in_flight -= 1
+
+    def _record(self, job: dict, future):
+        # Loaded by now: the job went through the scraper.
+        from .scraper import ScrapeError
+        try:
+            data = future.result()
+        except Exception as e:
+            error = str(e) if isinstance(e, ScrapeError) else f"Unexpected error: {e}"
+            database.fail_scrape_job(job['id'], error, retry_delay(job['attempts']))
+        else:
+            database.complete_scrape_job(job['id'], data)
+        self._notify(job['id'])
+
+    def _notify(self, job_id):
+        if self.on_change:
+            try:
+                self.on_change(job_id)
+            except Exception as e:
+                print(f"Scrape queue listener failed: {e}")
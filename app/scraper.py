@@ -1,106 +1,405 @@
 # app/scraper.py
 
-from playwright.sync_api import sync_playwright, Error
-import re
-import json
+from playwright.async_api import async_playwright, Error
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+import asyncio
+import sqlite3
+import threading
+from . import database
+from .resources import extract_resources, RESOURCE_DOMAINS
+from .urls import canonical_status_id
 
-class PostScraper:
+# What lean mode keeps out of the page. Posts are read from the DOM, so nothing here is needed:
+# the avatar URL is still taken from the <img> tag even though the image itself is never loaded.
+LEAN_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+LEAN_BLOCKED_HOSTS = (
+    "ads-twitter.com",
+    "ads-api.twitter.com",
+    "analytics.twitter.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+)
+
+
+def _host_matches(url: str, hosts) -> bool:
+    """True if url's host is one of hosts or a subdomain of one."""
+    host = urlsplit(url).hostname or ""
+    return any(host == blocked or host.endswith("." + blocked) for blocked in hosts)
+
+
+class ScrapeError(Exception):
+    """Why a scrape failed; raised only to callers that ask for errors (raise_errors=True)."""
+
+
+class _PageSlot:
+    """A browser context and its reusable page, used by one fetch at a time."""
+    def __init__(self):
+        self.context = None
+        self.page = None
+        self.pages_served = 0
+
+
+class AsyncPostScraper:
     """
-    Handles scraping post data from X.com using Playwright.
-    This class is isolated from the UI.
+    Scrapes X.com posts with Playwright's async API, several at a time.
+
+    One browser is shared by all fetches and kept warm until close(). At most
+    `concurrency` pages are open at once; each lives in its own context, which is
+    reused for `recycle_after` pages and then replaced. A URL that takes longer
+    than `timeout` seconds in total gives up and fails. If the browser
+    crashes it is relaunched on the next fetch.
+
+    In `lean` mode (the default) requests for images, video, fonts, stylesheets and
+    known tracker hosts are aborted before they leave the browser, since only the
+    post's DOM is read. `blocked_resource_types` and `blocked_hosts` replace the
+    default lists.
+
+    Links to `resource_domains` (default RESOURCE_DOMAINS) found in the post text
+    are returned as its resources.
+
+    Must be used from a single event loop.
     """
-    def _extract_resources(self, text: str) -> str | None:
+    def __init__(self, concurrency: int = 4, timeout: float = 30.0, recycle_after: int = 50, headless: bool = True,
+                 lean: bool = True, blocked_resource_types=None, blocked_hosts=None, resource_domains=RESOURCE_DOMAINS):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.recycle_after = max(1, recycle_after)
+        self.headless = headless
+        self.lean = lean
+        self.blocked_resource_types = frozenset(
+            LEAN_BLOCKED_RESOURCE_TYPES if blocked_resource_types is None else blocked_resource_types
+        )
+        self.blocked_hosts = tuple(LEAN_BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts)
+        self.resource_domains = frozenset(resource_domains)
+
+        self._playwright = None
+        self._browser = None
+        # asyncio primitives bind to the running loop on first use, so they can be made here.
+        # Creating them once means concurrent first fetches all share the same ones.
+        self._start_lock = asyncio.Lock()
+        self._browser_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._idle_slots = []
+        self._slots = []
+
+    async def start(self):
+        """Starts Playwright. Called automatically by the first fetch."""
+        # Several fetches can arrive before the driver is up; only the first may start one.
+        async with self._start_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+    async def close(self):
+        """Closes every page, the browser and Playwright itself."""
+        async with self._start_lock:
+            await self._close()
+
+    async def _close(self):
+        for slot in self._slots:
+            await self._close_slot(slot)
+        self._slots.clear()
+        self._idle_slots.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Error:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def fetch(self, url: str, raise_errors: bool = False) -> dict | None:
         """
-        Uses Regex to find valuable resource links within post text.
-        
-        Args:
-            text: The full text of the post.
+        Scrapes a single X.com URL, waiting for a free page if `concurrency` fetches are already running.
 
         Returns:
-            A JSON string of found URLs, or None if none are found.
+            A dictionary with scraped data if successful, otherwise None, or a
+            ScrapeError saying what went wrong if raise_errors is set.
+        """
+        await self.start()
+        try:
+            return await self._fetch(url)
+        except ScrapeError as e:
+            print(f"{e} ({url})")
+            if raise_errors:
+                raise
+            return None
+
+    async def _fetch(self, url: str) -> dict:
+        async with self._semaphore:
+            slot = self._idle_slots.pop() if self._idle_slots else self._new_slot()
+            try:
+                page = await self._ready_page(slot)
+                slot.pages_served += 1
+                data = await asyncio.wait_for(self._scrape_page(page, url), self.timeout)
+            except asyncio.TimeoutError:
+                # The page may still be navigating; start this slot's next fetch from a fresh context.
+                await self._close_slot(slot)
+                raise ScrapeError(f"Timed out after {self.timeout}s") from None
+            except Error as e:
+                await self._close_slot(slot)
+                raise ScrapeError(f"Playwright Error: {e}") from e
+            except Exception as e:
+                await self._close_slot(slot)
+                raise ScrapeError(f"An unexpected error occurred during scraping: {e}") from e
+            finally:
+                self._idle_slots.append(slot)
+        if data is None:
+            raise ScrapeError("No post found on the page.")
+        return data
+
+    async def fetch_many(self, urls):
         """
-        # Regex to find URLs. It's a bit broad to catch various URL formats.
-        url_pattern = r'https?://[^\s/$.?#].[^\s]*'
-        
-        # List of valuable domains to look for
-        resource_domains = [
-            'github.com',
-            'huggingface.co',
-            'arxiv.org',
-            'colab.research.google.com',
-            'gist.github.com'
-        ]
-        
-        found_urls = re.findall(url_pattern, text)
-        resource_links = []
-        
-        for url in found_urls:
-            # Clean up potential trailing characters that aren't part of the URL
-            cleaned_url = url.rstrip('.,)!"\'')
-            if any(domain in cleaned_url for domain in resource_domains):
-                resource_links.append(cleaned_url)
-        
-        if not resource_links:
+        Scrapes many URLs concurrently, yielding (url, data) pairs as each one finishes,
+        so the fastest results arrive first. data is None for URLs that failed.
+        """
+        async def tagged(url):
+            return url, await self.fetch(url)
+
+        tasks = [asyncio.ensure_future(tagged(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding fetches if the caller stops iterating early.
+            for task in tasks:
+                task.cancel()
+
+    def _new_slot(self) -> _PageSlot:
+        slot = _PageSlot()
+        self._slots.append(slot)
+        return slot
+
+    async def _ready_page(self, slot: _PageSlot):
+        """Returns the slot's page, relaunching or recycling whatever is unhealthy or worn out."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                # Every slot's context died with the old browser.
+                for other in self._slots:
+                    other.context = other.page = None
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        if slot.context is not None and slot.pages_served >= self.recycle_after:
+            # Long-lived contexts accumulate cookies, cache and memory; start clean now and then.
+            await self._close_slot(slot)
+        if slot.context is None:
+            slot.context = await self._browser.new_context()
+            if self.lean:
+                await slot.context.route("**/*", self._route_request)
+            slot.pages_served = 0
+        if slot.page is None or slot.page.is_closed():
+            slot.page = await slot.context.new_page()
+        return slot.page
+
+    async def _route_request(self, route):
+        """Lean mode's request filter: aborts anything the post's DOM doesn't need."""
+        request = route.request
+        if request.resource_type in self.blocked_resource_types or _host_matches(request.url, self.blocked_hosts):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _close_slot(self, slot: _PageSlot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Error:
+                pass
+        slot.context = None
+        slot.page = None
+
+    async def _scrape_page(self, page, url: str) -> dict | None:
+        """Loads url in an already open page and reads the post out of it."""
+        await page.goto(url, wait_until='domcontentloaded', timeout=20000)
+
+        article_selector = 'article[data-testid="tweet"]'
+        await page.wait_for_selector(article_selector, timeout=15000)
+        post_article = await page.query_selector(article_selector)
+
+        if not post_article:
             return None
-            
-        # Return a JSON string for easy storage in the database
-        return json.dumps(list(set(resource_links))) # Use set to get unique links
+
+        author_name = "Author Not Found"
+        author_handle = "@handle_not_found"
+        user_container = await post_article.query_selector('div[data-testid="User-Name"]')
+        if user_container:
+            spans = await user_container.query_selector_all('span')
+            if len(spans) >= 1:
+                author_name = (await spans[0].inner_text()).strip()
+            for span in spans:
+                span_text = (await span.inner_text()).strip()
+                if span_text.startswith('@'):
+                    author_handle = span_text
+                    break
+
+        post_text_element = await post_article.query_selector('div[data-testid="tweetText"]')
+        post_text = await post_text_element.inner_text() if post_text_element else "Post content not found."
+
+        avatar_element = await post_article.query_selector('div[data-testid="Tweet-User-Avatar"] img')
+        avatar_url = await avatar_element.get_attribute('src') if avatar_element else None
+
+        resources = extract_resources(post_text, self.resource_domains)
+
+        return {
+            "author_name": author_name,
+            "author_handle": author_handle,
+            "post_text": post_text,
+            "avatar_url": avatar_url,
+            "resources": resources
+        }
+
+
+class PostScraper:
+    """
+    Handles scraping post data from X.com using Playwright.
+    This class is isolated from the UI.
+
+    A blocking front end to AsyncPostScraper for code without an event loop, taking
+    the same arguments. The engine runs on a private event loop thread, started by
+    the first fetch, so its browser stays warm between calls. Every method is safe
+    to call from any thread; up to `concurrency` URLs are scraped at the same time.
+    Call close() when done to shut the browser down.
+
+    Successful scrapes are cached in the database by status id for `cache_ttl`
+    seconds (None turns the cache off), so a post pasted again, even as a twitter.com
+    link or with tracking parameters, comes back without opening a page. Requests
+    for a post that is already being scraped wait for that scrape instead of
+    starting another.
+    """
+    def __init__(self, *args, cache_ttl=database.SCRAPE_CACHE_TTL, cache_max_entries=database.SCRAPE_CACHE_MAX_ENTRIES, **kwargs):
+        self.engine = AsyncPostScraper(*args, **kwargs)
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+        # Status id -> Future of the scrape currently running for it.
+        self._in_flight = {}
+        # Scrapes finish on the event loop thread; their cache writes can wait on the database
+        # lock, so they are done here instead of stalling every page that is loading.
+        self._cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PostScraper-cache")
 
     def fetch_post_data(self, url: str) -> dict | None:
         """
-        Scrapes a given X.com URL for post details.
+        Scrapes a given X.com URL for post details, blocking until it is done.
 
         Returns:
             A dictionary with scraped data if successful, otherwise None.
         """
+        return self.submit(url).result()
+
+    def submit(self, url: str, raise_errors: bool = False) -> Future:
+        """
+        Starts scraping url, unless it is cached or already underway, and returns a
+        Future for its fetch_post_data() result. With raise_errors, a failed scrape
+        makes the Future raise a ScrapeError instead of returning None.
+        """
+        future = self._submit(url)
+        if raise_errors:
+            return future
+        quiet = Future()
+        future.add_done_callback(
+            lambda done: quiet.set_result(None if done.cancelled() or done.exception() else done.result())
+        )
+        return quiet
+
+    def _submit(self, url: str) -> Future:
+        status_id = canonical_status_id(url) if self.cache_ttl is not None else None
+        if status_id is None:
+            return self._start_fetch(url)
+
+        with self._lock:
+            future = self._in_flight.get(status_id)
+        if future is not None:
+            return future
+
+        cached = database.get_cached_scrape(status_id, self.cache_ttl)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            # Another thread may have started the same scrape while we checked the cache.
+            future = self._in_flight.get(status_id)
+            if future is not None:
+                return future
+            future = self._in_flight[status_id] = Future()
+        self._start_fetch(url).add_done_callback(
+            lambda scraped: self._hand_to_cache_writer(self._finish_cached_fetch, status_id, future, scraped)
+        )
+        return future
+
+    def _hand_to_cache_writer(self, fn, *args):
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                page.goto(url, wait_until='domcontentloaded', timeout=20000)
-                
-                article_selector = 'article[data-testid="tweet"]'
-                page.wait_for_selector(article_selector, timeout=15000)
-                post_article = page.query_selector(article_selector)
-
-                if not post_article:
-                    browser.close()
-                    return None
-
-                author_name = "Author Not Found"
-                author_handle = "@handle_not_found"
-                user_container = post_article.query_selector('div[data-testid="User-Name"]')
-                if user_container:
-                    spans = user_container.query_selector_all('span')
-                    if len(spans) >= 1:
-                        author_name = spans[0].inner_text().strip()
-                    for span in spans:
-                        if span.inner_text().strip().startswith('@'):
-                            author_handle = span.inner_text().strip()
-                            break
-                
-                post_text_element = post_article.query_selector('div[data-testid="tweetText"]')
-                post_text = post_text_element.inner_text() if post_text_element else "Post content not found."
-                
-                avatar_element = post_article.query_selector('div[data-testid="Tweet-User-Avatar"] img')
-                avatar_url = avatar_element.get_attribute('src') if avatar_element else None
-                
-                browser.close()
-
-                # --- ADDED: Call the new resource extraction method ---
-                resources = self._extract_resources(post_text)
-
-                return {
-                    "author_name": author_name,
-                    "author_handle": author_handle,
-                    "post_text": post_text,
-                    "avatar_url": avatar_url,
-                    # --- ADDED: Include resources in the returned data ---
-                    "resources": resources
-                }
-        except Error as e:
-            print(f"Playwright Error: {e}")
-            return None
+            self._cache_writer.submit(fn, *args)
+        except RuntimeError:
+            # Only after close() gave up waiting for the loop; the browser is gone, so nothing is left to write.
+            fn(*args)
+
+    def _finish_cached_fetch(self, status_id: str, future: Future, scraped: Future):
+        error = ScrapeError("Scraper was closed.") if scraped.cancelled() else scraped.exception()
+        if error is None:
+            try:
+                database.put_cached_scrape(status_id, scraped.result(), self.cache_max_entries)
+            except sqlite3.Error as e:
+                print(f"Could not cache scrape of status {status_id}: {e}")
+        with self._lock:
+            del self._in_flight[status_id]
+        if error is None:
+            future.set_result(scraped.result())
+        else:
+            future.set_exception(error)
+
+    def _start_fetch(self, url: str) -> Future:
+        loop = self._ensure_loop()
+        if loop is None:
+            future = Future()
+            future.set_exception(ScrapeError("Scraper is closed."))
+            return future
+        return asyncio.run_coroutine_threadsafe(self.engine.fetch(url, raise_errors=True), loop)
+
+    def fetch_many(self, urls):
+        """Scrapes many URLs concurrently, yielding (url, data) pairs in the order they finish."""
+        futures = {self.submit(url): url for url in dict.fromkeys(urls)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def close(self, timeout: float = 10.0):
+        """Closes the browser and stops the event loop thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.engine.close(), loop).result(timeout)
         except Exception as e:
-            print(f"An unexpected error occurred during scraping: {e}")
-            return None
\ No newline at end of file
+            print(f"Error while closing the scraper: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._cache_writer.submit(database.close_db_connection)
+        self._cache_writer.shutdown(wait=True)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._closed:
+                print("Scraper is closed; not fetching.")
+                return None
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, daemon=True, name="PostScraper-loop")
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
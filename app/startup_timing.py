@@ -0,0 +1,26 @@
+# app/startup_timing.py
+"""
+Records where the desktop app's startup time goes. Off unless main.py is run
+with --startup-timing, in which case each mark() is timed against the previous
+one and report() prints the breakdown once the window is up.
+"""
+
+import sys
+import time
+
+_started = time.perf_counter()
+_marks = []
+enabled = False
+
+def mark(step: str):
+    """Notes that `step` just finished. Does nothing unless timing is enabled."""
+    if enabled:
+        _marks.append((step, time.perf_counter()))
+
+def report(out=sys.stderr):
+    previous = _started
+    print("Startup timing (ms, since main.py started):", file=out)
+    for step, at in _marks:
+        print(f"  {(at - previous) * 1000:8.1f}  {step}", file=out)
+        previous = at
+    print(f"  {(previous - _started) * 1000:8.1f}  total", file=out)
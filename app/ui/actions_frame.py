@@ -76,6 +76,11 @@ class ActionsFrame(customtkinter.CTkFrame):
         self.new_post_button.grid_remove()
         self.save_button.grid(row=0, column=0, columnspan=3, padx=5, sticky="ew")
 
+    def set_buttons_state(self, state: str):
+        """Enables ("normal") or disables ("disabled") all the action buttons, e.g. while a save is in progress."""
+        for button in (self.save_button, self.update_button, self.delete_button, self.new_post_button):
+            button.configure(state=state)
+
     def show_edit_mode(self):
         """Configures the frame to show 'Update', 'Delete', and 'New' buttons for an existing post."""
         self.save_button.grid_remove()
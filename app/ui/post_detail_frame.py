@@ -1,13 +1,21 @@
 # app/ui/post_detail_frame.py
 
 import customtkinter
-import threading
 from .actions_frame import ActionsFrame
+from ..urls import canonical_status_id
 
 class PostDetailFrame(customtkinter.CTkFrame):
-    def __init__(self, master, assets):
+    """
+    The form for viewing, editing and fetching a post.
+
+    Args:
+        call_soon: call_soon(callback, *args) runs the callback on the Tk thread; avatar
+            loads use it to hand their image back from the image executor.
+    """
+    def __init__(self, master, assets, call_soon):
         super().__init__(master)
         self.assets = assets
+        self.call_soon = call_soon
 
         self.url_fetch_callback = None
         self.save_callback = None
@@ -16,6 +24,11 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.new_callback = None
         self.manage_projects_callback = None
         self.manage_categories_callback = None
+        self.queue_callback = None
+
+        # Bumped whenever the avatar on show changes, so a load for an earlier post can tell it's stale.
+        self.avatar_generation = 0
+        self.avatar_future = None
 
         self._setup_layout()
         self._create_widgets()
@@ -29,11 +42,21 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.form_label = customtkinter.CTkLabel(self, text="Post Details", font=self.assets.font_heading)
         self.form_label.grid(row=0, column=0, columnspan=2, padx=20, pady=(20, 10), sticky="w")
 
-        url_label = customtkinter.CTkLabel(self, text="Post URL", font=self.assets.font_small)
-        url_label.grid(row=1, column=0, columnspan=2, padx=20, pady=(10, 0), sticky="w")
-        self.url_entry = customtkinter.CTkEntry(self, font=self.assets.font_body, placeholder_text="Paste a valid X.com URL to automatically fetch data...")
+        url_label_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        url_label_frame.grid(row=1, column=0, columnspan=2, padx=20, pady=(10, 0), sticky="ew")
+        url_label = customtkinter.CTkLabel(url_label_frame, text="Post URL", font=self.assets.font_small)
+        url_label.pack(side="left")
+        self.queue_button = customtkinter.CTkButton(
+            url_label_frame, text="Queue...", font=self.assets.font_small,
+            fg_color="transparent", width=60,
+            command=lambda: self.queue_callback() if self.queue_callback else None
+        )
+        self.queue_button.pack(side="right")
+        self.url_entry = customtkinter.CTkEntry(self, font=self.assets.font_body, placeholder_text="Paste an X.com post URL, or type one and press Enter, to fetch its data...")
         self.url_entry.grid(row=2, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="ew")
-        self.url_entry.bind("<KeyRelease>", self._on_url_change)
+        # Fetch once a whole URL is in: on paste or Return, not on every key typed.
+        self.url_entry.bind("<Return>", self._on_url_entered)
+        self.url_entry.bind("<<Paste>>", self._on_url_pasted)
 
         profile_frame = customtkinter.CTkFrame(self, fg_color="transparent")
         profile_frame.grid(row=3, column=0, columnspan=2, padx=20, pady=10, sticky="ew")
@@ -116,13 +139,7 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.project_combobox.set(post_data.get('project_name', "Uncategorized Ideas"))
         self.category_combobox.set(post_data.get('category_name', ""))
 
-        avatar_url = post_data.get('avatar_url')
-        if avatar_url:
-            thread = threading.Thread(target=self._load_and_set_avatar, args=(avatar_url,))
-            thread.daemon = True
-            thread.start()
-        else:
-            self.avatar_label.configure(image=self.assets.default_avatar)
+        self._show_avatar(post_data.get('avatar_url'))
 
         self.set_edit_mode()
 
@@ -132,10 +149,7 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.author_handle_label.configure(text=scraped_data["author_handle"])
         self.post_text_box.insert("1.0", scraped_data["post_text"])
         
-        if scraped_data["avatar_url"]:
-            thread = threading.Thread(target=self._load_and_set_avatar, args=(scraped_data["avatar_url"],))
-            thread.daemon = True
-            thread.start()
+        self._show_avatar(scraped_data["avatar_url"])
             
         self.notes_text_box.focus()
 
@@ -158,7 +172,7 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.notes_text_box.delete("1.0", "end")
         self.author_name_label.configure(text="Author Name")
         self.author_handle_label.configure(text="@author_handle")
-        self.avatar_label.configure(image=self.assets.default_avatar)
+        self._show_avatar(None)
         self.project_combobox.set("")
         self.category_combobox.set("")
         self.set_save_mode()
@@ -171,16 +185,31 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.form_label.configure(text="Edit Post Details")
         self.actions_frame.show_edit_mode()
 
+    def set_url(self, url: str):
+        self.url_entry.delete(0, "end")
+        self.url_entry.insert(0, url)
+
+    def set_queue_count(self, pending: int):
+        """Shows how many URLs are waiting in the scrape queue on its button."""
+        self.queue_button.configure(text=f"Queue ({pending})..." if pending else "Queue...")
+
     def set_url_entry_state(self, state: str):
         self.url_entry.configure(state=state)
 
+    def set_actions_state(self, state: str):
+        self.actions_frame.set_buttons_state(state)
+
+    def set_database_buttons_state(self, state: str):
+        self.backup_button.configure(state=state)
+        self.restore_button.configure(state=state)
+
     def update_project_menu(self, project_names: list):
         self.project_combobox.configure(values=project_names)
 
     def update_category_menu(self, category_names: list):
         self.category_combobox.configure(values=category_names)
 
-    def connect_callbacks(self, save, update, delete, new, fetch, backup, restore, manage_projects, manage_categories):
+    def connect_callbacks(self, save, update, delete, new, fetch, backup, restore, manage_projects, manage_categories, queue):
         self.actions_frame.save_callback = save
         self.actions_frame.update_callback = update
         self.actions_frame.delete_callback = delete
@@ -190,13 +219,41 @@ class PostDetailFrame(customtkinter.CTkFrame):
         self.restore_button.configure(command=restore)
         self.manage_projects_callback = manage_projects
         self.manage_categories_callback = manage_categories
+        self.queue_callback = queue
+
+    def _on_url_pasted(self, event=None):
+        # <<Paste>> fires before the text is inserted.
+        self.after_idle(self._on_url_entered)
 
-    def _on_url_change(self, event=None):
-        url = self.url_entry.get()
-        if self.url_fetch_callback and ("x.com" in url or "twitter.com" in url) and "/status/" in url:
+    def _on_url_entered(self, event=None):
+        url = self.url_entry.get().strip()
+        if self.url_fetch_callback and canonical_status_id(url) is not None:
             self.url_fetch_callback(url)
 
-    def _load_and_set_avatar(self, url):
+    def _show_avatar(self, url):
+        """
+        Shows the avatar at url, or the default one if url is empty.
+        An avatar already in memory is shown at once; otherwise the default is shown
+        while the shared image executor loads it. Any load for the previous avatar is
+        cancelled if it hasn't started, and ignored when it finishes if it has.
+        """
+        self.avatar_generation += 1
+        if self.avatar_future is not None:
+            self.avatar_future.cancel()
+            self.avatar_future = None
+
+        avatar_image = self.assets.cached_avatar(url) if url else None
+        self.avatar_label.configure(image=avatar_image or self.assets.default_avatar)
+        if url and avatar_image is None:
+            self.avatar_future = self.assets.image_executor.submit(self._load_avatar, url, self.avatar_generation)
+
+    def _load_avatar(self, url, generation):
+        # Runs on the image executor; the label is only touched back on the Tk thread.
+        if generation != self.avatar_generation:
+            return
         avatar_image = self.assets.load_avatar_from_url(url)
-        if avatar_image:
-            self.after(0, lambda: self.avatar_label.configure(image=avatar_image))
\ No newline at end of file
+        self.call_soon(self._set_avatar, generation, avatar_image)
+
+    def _set_avatar(self, generation, avatar_image):
+        if generation == self.avatar_generation:
+            self.avatar_label.configure(image=avatar_image)
\ No newline at end of file
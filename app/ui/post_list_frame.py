@@ -1,22 +1,68 @@
 # app/ui/post_list_frame.py
 
+import sys
 import customtkinter
 
+# Every row is the same height, so the rows on screen can be worked out from the scroll position alone.
+ROW_HEIGHT = 64
+ROW_GAP = 6
+# Rows kept ready above and below the visible ones, so a short scroll doesn't show blank space.
+OVERSCAN = 4
+# Ask the controller for the next page once the view gets this close to the last loaded row.
+LOAD_MORE_THRESHOLD = 10
+PREVIEW_LENGTH = 80
+# Searching waits until typing pauses for this long, so a word costs one query instead of one per key.
+SEARCH_DEBOUNCE_MS = 250
+SELECTED_COLOR = ("#E5E5E5", "#2A2D2E")
+
+class _PostRow:
+    """One recycled row: a frame with an author and a preview label, shown at some index of the list."""
+    def __init__(self, frame, author_label, text_label, window_id):
+        self.frame = frame
+        self.author_label = author_label
+        self.text_label = text_label
+        self.window_id = window_id
+        self.index = None
+        self.post = None
+        # The (author, preview) the labels were last set to, so unchanged rows aren't reconfigured.
+        self.labels = None
+        self.selected = False
+
 class PostListFrame(customtkinter.CTkFrame):
     """
     A frame that displays a searchable list of posts.
     It is responsible for its own layout and widgets. When a post is selected,
     it notifies the parent controller via a callback.
+
+    The list is virtualized: posts live in posts_data, and widgets exist only for
+    the rows on screen plus a few either side. Scrolling moves those row widgets
+    to their new positions and fills them with other posts instead of creating
+    new ones, so the cost of the list doesn't grow with the number of posts.
+
+    Row widgets on screen are keyed by post id. When the list is replaced, each
+    post keeps its row: a post that moved only has its row repositioned, and
+    labels are only rewritten for posts whose text actually changed. Saving one
+    post therefore touches one row, not the whole list.
     """
     def __init__(self, master, assets):
         super().__init__(master)
         self.assets = assets
         self.posts_data = []
-        self.selected_post_frame = None
+        self.has_more = False
+        self.load_more_requested = False
+        self.selected_post_id = None
+        self.search_job = None
+        self.last_search_term = ""
+
+        # Row widgets by the id of the post they currently show, and spare rows waiting to be reused.
+        self.visible_rows = {}
+        self.spare_rows = []
 
         # Callbacks to be set by the controller
         self.post_selected_callback = None
         self.create_briefing_callback = None
+        self.load_more_callback = None
+        self.search_callback = None
 
         self._setup_layout()
         self._create_widgets()
@@ -30,19 +76,37 @@ class PostListFrame(customtkinter.CTkFrame):
         """Create and place all the UI widgets for the post list view."""
         list_label = customtkinter.CTkLabel(self, text="Saved Posts", font=self.assets.font_heading)
         list_label.grid(row=0, column=0, padx=20, pady=(20, 10), sticky="w")
-        
+
         self.search_entry = customtkinter.CTkEntry(self, placeholder_text="Search...", font=self.assets.font_body)
         self.search_entry.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
         self.search_entry.bind("<KeyRelease>", self._on_search_change)
-        
+
         search_icon_label = customtkinter.CTkLabel(self.search_entry, text="", image=self.assets.search_icon)
         search_icon_label.place(relx=1.0, rely=0.5, x=-10, anchor="e")
 
-        self.scrollable_post_list = customtkinter.CTkScrollableFrame(self)
-        self.scrollable_post_list.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="nsew")
-        self.scrollable_post_list.grid_columnconfigure(0, weight=1)
+        list_container = customtkinter.CTkFrame(self)
+        list_container.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="nsew")
+        list_container.grid_columnconfigure(0, weight=1)
+        list_container.grid_rowconfigure(0, weight=1)
 
-        briefing_button = customtkinter.CTkButton(
+        self.canvas = customtkinter.CTkCanvas(
+            list_container, highlightthickness=0, borderwidth=0,
+            bg=list_container._apply_appearance_mode(list_container.cget("fg_color"))
+        )
+        self.canvas.grid(row=0, column=0, padx=(5, 0), pady=5, sticky="nsew")
+        self.scrollbar = customtkinter.CTkScrollbar(list_container, command=self.canvas.yview)
+        self.scrollbar.grid(row=0, column=1, padx=(0, 3), pady=5, sticky="ns")
+        self.canvas.configure(yscrollcommand=self._on_canvas_scrolled)
+        if sys.platform.startswith("win"):
+            self.canvas.configure(yscrollincrement=1)
+        elif sys.platform == "darwin":
+            self.canvas.configure(yscrollincrement=8)
+        self.canvas.bind("<Configure>", self._on_canvas_resized)
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+")
+
+        self.briefing_button = customtkinter.CTkButton(
             self,
             text="Create Briefing",
             image=self.assets.briefing_icon,
@@ -52,77 +116,228 @@ class PostListFrame(customtkinter.CTkFrame):
             compound="left",
             anchor="center"
         )
-        briefing_button.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
+        self.briefing_button.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
 
     # --- PUBLIC METHODS (API for the controller) ---
 
-    def connect_callbacks(self, post_selected, create_briefing):
+    def connect_callbacks(self, post_selected, create_briefing, load_more, search):
         """Connects callbacks to methods in the controller."""
         self.post_selected_callback = post_selected
         self.create_briefing_callback = create_briefing
+        self.load_more_callback = load_more
+        self.search_callback = search
 
-    def refresh_post_list(self, posts: list):
+    def refresh_post_list(self, posts: list, has_more: bool = False):
         """
-        Clears and re-populates the list of posts from a new list of data.
+        Replaces the list of posts with a new list of data and scrolls back to the top.
         This method should be called by the main controller.
+        `has_more` means the controller can supply more posts; they are requested
+        through load_more_callback when the user scrolls near the end.
+        The selected post stays selected if it is in the new list.
+        """
+        self.posts_data = list(posts)
+        self.has_more = has_more
+        self.load_more_requested = False
+        self._update_scroll_region()
+        self.canvas.yview_moveto(0)
+        self._render_visible_rows()
+
+    def update_posts(self, posts: list, has_more: bool = False):
+        """
+        Replaces the list of posts like refresh_post_list(), but keeps the view on the same posts.
+        Use it after a post was saved, updated or deleted: rows are matched to posts by id,
+        so only the rows for posts that were added, removed, edited or moved are touched.
         """
-        self.posts_data = posts
-        self.selected_post_frame = None
-
-        # Clear existing widgets
-        for widget in self.scrollable_post_list.winfo_children():
-            widget.destroy()
-            
-        # Create new widgets from the data
-        for i, post in enumerate(self.posts_data):
-            post_frame = customtkinter.CTkFrame(self.scrollable_post_list, fg_color="transparent", corner_radius=5)
-            post_frame.grid(row=i, column=0, padx=5, pady=5, sticky="ew")
-            post_frame.grid_columnconfigure(0, weight=1)
-            
-            author = post.get('author', "Unknown author")
-            post_text = post.get('post_text', "No content")
-            display_text = f"{post_text[:80]}..." if len(post_text) > 80 else post_text
-            
-            author_label = customtkinter.CTkLabel(post_frame, text=author, font=self.assets.font_button, justify="left", anchor="w")
-            author_label.grid(row=0, column=0, padx=10, pady=(10, 0), sticky="w")
-            
-            post_content_label = customtkinter.CTkLabel(post_frame, text=display_text, font=self.assets.font_body, justify="left", anchor="w")
-            post_content_label.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="w")
-            
-            # Bind clicks to the internal handler
-            command = lambda e, p=post, f=post_frame: self._on_post_selected(p, f)
-            post_frame.bind("<Button-1>", command)
-            author_label.bind("<Button-1>", command)
-            post_content_label.bind("<Button-1>", command)
+        top = self.canvas.canvasy(0)
+        old_index = int(top // ROW_HEIGHT)
+        anchor_id = self.posts_data[old_index]['id'] if old_index < len(self.posts_data) else None
+
+        self.posts_data = list(posts)
+        self.has_more = has_more
+        self.load_more_requested = False
+        self._update_scroll_region()
+
+        # Keep the post at the top of the view where it was, even if posts were added or removed above it.
+        new_index = next((i for i, post in enumerate(self.posts_data) if post['id'] == anchor_id), old_index)
+        top += (new_index - old_index) * ROW_HEIGHT
+        height = len(self.posts_data) * ROW_HEIGHT
+        # Moving the view also clamps it to the new end if the list got shorter.
+        self.canvas.yview_moveto(top / height if height else 0)
+        self._render_visible_rows()
+
+    def append_posts(self, posts: list, has_more: bool = False):
+        """Adds the next page of posts to the end of the list."""
+        self.posts_data.extend(posts)
+        self.has_more = has_more
+        self.load_more_requested = False
+        self._update_scroll_region()
+        self._render_visible_rows()
+
+    def set_briefing_running(self, running: bool):
+        """Switches the briefing button between starting and cancelling a briefing."""
+        self.briefing_button.configure(text="Cancel Briefing" if running else "Create Briefing")
+
+    def set_briefing_state(self, state: str):
+        self.briefing_button.configure(state=state)
 
     def clear_selection(self):
-        """Visually deselects the currently selected post frame."""
-        if self.selected_post_frame:
-            self.selected_post_frame.configure(fg_color="transparent")
-            self.selected_post_frame = None
+        """Visually deselects the currently selected post."""
+        self.selected_post_id = None
+        for row in self.visible_rows.values():
+            self._paint_selection(row)
 
     # --- PRIVATE METHODS ---
 
     def _on_search_change(self, event=None):
         """
         Internal handler for search entry changes.
-        It calls the post_selected_callback with the search term.
-        The controller is responsible for fetching the filtered data.
+        Restarts the debounce timer; the search runs once typing pauses.
+        Keys that don't change the text (arrows, Shift) are ignored.
         """
-        if self.post_selected_callback:
-            # We reuse the post_selected_callback to trigger a refresh.
-            # The controller will see the post_data is None and just refresh the list.
-            self.post_selected_callback(None, self.search_entry.get())
+        if self.search_entry.get() == self.last_search_term and self.search_job is None:
+            return
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self._submit_search)
 
-    def _on_post_selected(self, post_data: dict, post_frame: customtkinter.CTkFrame):
+    def _submit_search(self):
+        """
+        Hands the search term to the controller, which is responsible for fetching
+        the filtered data and calling refresh_post_list() with it.
+        """
+        self.search_job = None
+        search_term = self.search_entry.get()
+        if search_term == self.last_search_term:
+            return
+        self.last_search_term = search_term
+        if self.search_callback:
+            self.search_callback(search_term)
+
+    def _on_row_clicked(self, row: _PostRow):
         """
         Internal handler for when a post is clicked.
         It updates the visual selection and calls the main controller's callback.
         """
-        self.clear_selection()
-        
-        post_frame.configure(fg_color=("#E5E5E5", "#2A2D2E"))
-        self.selected_post_frame = post_frame
-        
+        if row.post is None:
+            return
+        self.selected_post_id = row.post['id']
+        for other in self.visible_rows.values():
+            self._paint_selection(other)
+
         if self.post_selected_callback:
-            self.post_selected_callback(post_data, self.search_entry.get())
\ No newline at end of file
+            self.post_selected_callback(row.post, self.search_entry.get())
+
+    # --- Virtual scrolling ---
+
+    def _create_row(self) -> _PostRow:
+        frame = customtkinter.CTkFrame(self.canvas, fg_color="transparent", corner_radius=5)
+        frame.grid_columnconfigure(0, weight=1)
+        author_label = customtkinter.CTkLabel(frame, text="", font=self.assets.font_button, justify="left", anchor="w")
+        author_label.grid(row=0, column=0, padx=10, pady=(8, 0), sticky="w")
+        text_label = customtkinter.CTkLabel(frame, text="", font=self.assets.font_body, justify="left", anchor="w")
+        text_label.grid(row=1, column=0, padx=10, pady=(0, 8), sticky="w")
+
+        window_id = self.canvas.create_window(
+            0, 0, window=frame, anchor="nw",
+            width=max(1, self.canvas.winfo_width()), height=ROW_HEIGHT - ROW_GAP, state="hidden"
+        )
+        row = _PostRow(frame, author_label, text_label, window_id)
+
+        # Bind clicks once; the handler looks up whichever post the row shows at the time.
+        command = lambda e, r=row: self._on_row_clicked(r)
+        frame.bind("<Button-1>", command)
+        author_label.bind("<Button-1>", command)
+        text_label.bind("<Button-1>", command)
+        return row
+
+    def _show_row(self, row: _PostRow, index: int):
+        """Moves row to index and fills it with that post, touching only what differs from what it shows."""
+        post = self.posts_data[index]
+        if row.post is not post:
+            author = post.get('author') or "Unknown author"
+            # Search results carry a snippet with the matched terms marked; prefer it over the plain preview.
+            post_text = " ".join((post.get('snippet') or post.get('post_text') or "No content").split())
+            display_text = f"{post_text[:PREVIEW_LENGTH]}..." if len(post_text) > PREVIEW_LENGTH else post_text
+            if row.labels != (author, display_text):
+                row.author_label.configure(text=author)
+                row.text_label.configure(text=display_text)
+                row.labels = (author, display_text)
+            row.post = post
+        if row.index != index:
+            self.canvas.coords(row.window_id, 0, index * ROW_HEIGHT)
+            if row.index is None:
+                self.canvas.itemconfigure(row.window_id, state="normal")
+            row.index = index
+        self._paint_selection(row)
+
+    def _paint_selection(self, row: _PostRow):
+        selected = row.post is not None and row.post['id'] == self.selected_post_id
+        if selected != row.selected:
+            row.frame.configure(fg_color=SELECTED_COLOR if selected else "transparent")
+            row.selected = selected
+
+    def _release_row(self, row: _PostRow):
+        self.canvas.itemconfigure(row.window_id, state="hidden")
+        row.index = None
+        self.spare_rows.append(row)
+
+    def _visible_range(self) -> tuple[int, int]:
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // ROW_HEIGHT) - OVERSCAN)
+        last = min(len(self.posts_data), int(bottom // ROW_HEIGHT) + 1 + OVERSCAN)
+        return first, last
+
+    def _render_visible_rows(self):
+        """
+        Makes sure exactly the posts in view (plus overscan) have rows. A post that
+        already has a row keeps it; rows of posts that scrolled away or left the list
+        are reused for the posts that need one.
+        """
+        first, last = self._visible_range()
+        wanted = {self.posts_data[index]['id']: index for index in range(first, last)}
+        for post_id in [post_id for post_id in self.visible_rows if post_id not in wanted]:
+            self._release_row(self.visible_rows.pop(post_id))
+        for post_id, index in wanted.items():
+            row = self.visible_rows.get(post_id)
+            if row is None:
+                row = self.spare_rows.pop() if self.spare_rows else self._create_row()
+                self.visible_rows[post_id] = row
+            self._show_row(row, index)
+
+        if self.has_more and not self.load_more_requested and last >= len(self.posts_data) - LOAD_MORE_THRESHOLD:
+            if self.load_more_callback:
+                self.load_more_requested = True
+                # Let this scroll finish drawing before the controller goes to the database.
+                self.after_idle(self.load_more_callback)
+
+    def _update_scroll_region(self):
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), len(self.posts_data) * ROW_HEIGHT))
+
+    def _on_canvas_scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render_visible_rows()
+
+    def _on_canvas_resized(self, event):
+        for row in self.visible_rows.values():
+            self.canvas.itemconfigure(row.window_id, width=event.width)
+        for row in self.spare_rows:
+            self.canvas.itemconfigure(row.window_id, width=event.width)
+        self._update_scroll_region()
+        self._render_visible_rows()
+
+    def _on_mouse_wheel(self, event):
+        # Bound app-wide (like CTkScrollableFrame does), so only react when the pointer is over the list.
+        widget = event.widget
+        while widget is not None and widget is not self.canvas:
+            widget = getattr(widget, "master", None)
+        if widget is None or self.canvas.yview() == (0.0, 1.0):
+            return
+        if event.num == 4:
+            self.canvas.yview_scroll(-1, "units")
+        elif event.num == 5:
+            self.canvas.yview_scroll(1, "units")
+        elif sys.platform.startswith("win"):
+            self.canvas.yview_scroll(-int(event.delta / 6), "units")
+        else:
+            self.canvas.yview_scroll(-event.delta, "units")
@@ -0,0 +1,156 @@
+# app/ui/scrape_queue_dialog.py
+
+import customtkinter
+
+STATUS_COLORS = {
+    "queued": "gray",
+    "running": "#1F6AA5",
+    "done": "#2E7D32",
+    "failed": "#D32F2F",
+}
+# The button a job's row offers, by status.
+JOB_ACTIONS = {
+    "done": "Open",
+    "failed": "Retry",
+}
+ROW_WIDGETS = ("status", "url", "action", "remove", "error")
+
+class ScrapeQueueDialog(customtkinter.CTkToplevel):
+    """
+    A window for queuing many post URLs at once and watching them get scraped.
+    It doesn't block the main window, so posts can be edited while the queue runs.
+    All actions go to the controller through callbacks; the controller calls
+    refresh() whenever the queue changes.
+    """
+    def __init__(self, master, assets, enqueue_callback, open_callback, retry_callback, remove_callback, clear_finished_callback):
+        super().__init__(master)
+        self.assets = assets
+
+        self.enqueue_callback = enqueue_callback
+        self.open_callback = open_callback
+        self.retry_callback = retry_callback
+        self.remove_callback = remove_callback
+        self.clear_finished_callback = clear_finished_callback
+
+        # --- Window Configuration ---
+        self.title("Scrape Queue")
+        self.geometry("560x620")
+        self.transient(master)
+
+        # --- Main Frame ---
+        self.main_frame = customtkinter.CTkFrame(self)
+        self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame.grid_rowconfigure(4, weight=1)
+
+        # --- Widgets ---
+        title_label = customtkinter.CTkLabel(self.main_frame, text="Scrape Queue", font=assets.font_heading)
+        title_label.grid(row=0, column=0, columnspan=2, pady=(10, 10))
+
+        self.urls_box = customtkinter.CTkTextbox(self.main_frame, height=90, font=assets.font_body)
+        self.urls_box.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10)
+
+        add_button = customtkinter.CTkButton(
+            self.main_frame, text="Add to Queue (one URL per line)", font=assets.font_button, command=self._on_add
+        )
+        add_button.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(5, 10))
+
+        self.summary_label = customtkinter.CTkLabel(self.main_frame, text="", font=assets.font_small, anchor="w")
+        self.summary_label.grid(row=3, column=0, columnspan=2, sticky="ew", padx=10)
+
+        self.jobs_frame = customtkinter.CTkScrollableFrame(self.main_frame)
+        self.jobs_frame.grid(row=4, column=0, columnspan=2, sticky="nsew", pady=(0, 10))
+        self.jobs_frame.grid_columnconfigure(1, weight=1)
+        # Job id -> that job's row: its widgets, and the job and position they show.
+        self.job_rows = {}
+
+        clear_button = customtkinter.CTkButton(
+            self.main_frame, text="Clear Finished", fg_color="transparent",
+            command=lambda: self.clear_finished_callback()
+        )
+        clear_button.grid(row=5, column=0, padx=(0, 5), sticky="ew")
+        close_button = customtkinter.CTkButton(self.main_frame, text="Close", command=self.destroy)
+        close_button.grid(row=5, column=1, padx=(5, 0), sticky="ew")
+
+    def refresh(self, jobs: list, counts: dict):
+        """
+        Brings the job list up to date. jobs are dicts from database.get_scrape_jobs().
+        Rows are kept per job id, so only the rows of jobs that changed or moved are
+        touched, and widgets are only created or destroyed for jobs added or removed.
+        """
+        summary = ", ".join(f"{counts[status]} {status}" for status in STATUS_COLORS if counts.get(status))
+        self.summary_label.configure(text=summary or "The queue is empty.")
+
+        job_ids = {job['id'] for job in jobs}
+        for job_id in [job_id for job_id in self.job_rows if job_id not in job_ids]:
+            row = self.job_rows.pop(job_id)
+            for key in ROW_WIDGETS:
+                row[key].destroy()
+
+        for position, job in enumerate(jobs):
+            row = self.job_rows.get(job['id'])
+            if row is None:
+                row = self.job_rows[job['id']] = self._create_row()
+            if row['job'] != job or row['position'] != position:
+                self._show_job(row, job, position)
+
+    def _create_row(self):
+        font = self.assets.font_small
+        row = {
+            'job': None,
+            'position': None,
+            'status': customtkinter.CTkLabel(self.jobs_frame, text="", width=60, font=font),
+            'url': customtkinter.CTkLabel(self.jobs_frame, text="", font=font, anchor="w"),
+            'action': customtkinter.CTkButton(self.jobs_frame, text="", width=60),
+            'remove': customtkinter.CTkButton(self.jobs_frame, text="Remove", width=60, fg_color="transparent"),
+            'error': customtkinter.CTkLabel(
+                self.jobs_frame, text="", font=font, text_color="#D32F2F", anchor="w", justify="left"
+            ),
+        }
+        # The buttons act on the row's latest job, which _show_job() keeps current.
+        row['action'].configure(command=lambda: self._on_job_action(row['job']))
+        row['remove'].configure(command=lambda: self.remove_callback(row['job']['id']))
+        return row
+
+    def _show_job(self, row, job, position):
+        row['job'], row['position'] = job, position
+        grid_row = position * 2
+        status = job['status']
+
+        row['status'].configure(text=status, text_color=STATUS_COLORS.get(status, "gray"))
+        row['status'].grid(row=grid_row, column=0, padx=(5, 5), pady=(5, 0), sticky="w")
+
+        url = job['url']
+        row['url'].configure(text=f"{url[:55]}..." if len(url) > 55 else url)
+        row['url'].grid(row=grid_row, column=1, pady=(5, 0), sticky="ew")
+
+        action = JOB_ACTIONS.get(status)
+        if action:
+            row['action'].configure(text=action)
+            row['action'].grid(row=grid_row, column=2, padx=5, pady=(5, 0))
+        else:
+            row['action'].grid_remove()
+
+        if status != "running":
+            row['remove'].grid(row=grid_row, column=3, padx=5, pady=(5, 0))
+        else:
+            row['remove'].grid_remove()
+
+        if job['last_error']:
+            attempts = f"attempt {job['attempts']}/{job['max_attempts']}: "
+            row['error'].configure(text=attempts + job['last_error'][:80])
+            row['error'].grid(row=grid_row + 1, column=1, columnspan=3, sticky="ew")
+        else:
+            row['error'].grid_remove()
+
+    def _on_job_action(self, job):
+        if job['status'] == "done":
+            self.open_callback(job)
+        elif job['status'] == "failed":
+            self.retry_callback(job['id'])
+
+    def _on_add(self):
+        urls = [line.strip() for line in self.urls_box.get("1.0", "end").splitlines() if line.strip()]
+        if urls:
+            self.enqueue_callback(urls)
+            self.urls_box.delete("1.0", "end")
@@ -0,0 +1,20 @@
+# app/urls.py
+"""
+Recognizes X.com post URLs. Kept apart from scraper.py so the form can check a URL
+without importing Playwright.
+"""
+
+import re
+
+# X.com and Twitter post URLs in their various forms: x.com or twitter.com, with or without
+# www./mobile., /user/status/ or /i/web/status/, trailing /photo/1 or ?s=20 tracking
+# parameters. Group 1 is the status id, which identifies the post whatever the URL looks like.
+STATUS_URL_PATTERN = re.compile(
+    r'^(?:https?://)?(?:[\w-]+\.)?(?:x|twitter)\.com/(?:i/web|[^/?#]+)/status(?:es)?/(\d+)',
+    re.IGNORECASE
+)
+
+def canonical_status_id(url: str) -> str | None:
+    """Returns the status id of an X.com post URL, or None if url isn't one."""
+    match = STATUS_URL_PATTERN.match(url.strip())
+    return match.group(1) if match else None
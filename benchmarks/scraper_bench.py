@@ -0,0 +1,174 @@
+# benchmarks/scraper_bench.py
+"""
+Measures PostScraper against the local X.com stand-in (see stand_in.py); no network needed.
+
+For each scraping mode (lean and full pages) and each concurrency level, a fresh
+scraper is warmed up with one fetch (reported as cold start) and then scrapes
+--urls post pages. Reported per run: pages/sec, per-page latency (p50/p95, page
+load to data extracted, excluding time queued for a free page), bytes served per
+page, and the peak resident memory of this process plus the browser processes.
+
+    python -m benchmarks.scraper_bench
+    python -m benchmarks.scraper_bench --concurrency 1 4 16 --urls 100 --modes lean
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+from app.scraper import PostScraper
+from benchmarks.stand_in import StandInServer
+
+DEFAULT_CONCURRENCY = (1, 2, 4, 8)
+
+
+def tree_rss_bytes(root_pid: int) -> int | None:
+    """Resident memory of root_pid and all its descendants, from /proc (Linux only; None elsewhere)."""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name can contain spaces; the parent pid is the second field after it.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, pending = 0, [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, ()))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class PeakMemorySampler:
+    """Samples tree_rss_bytes() on a background thread until stopped and keeps the peak."""
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        pid = os.getpid()
+        while True:
+            rss = tree_rss_bytes(pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            if self._stop.wait(self.interval):
+                return
+
+
+def _time_page_loads(scraper: PostScraper) -> list[float]:
+    """Records how long each page takes from navigation to extracted data, leaving out queueing."""
+    timings = []
+    scrape_page = scraper.engine._scrape_page
+
+    async def timed_scrape_page(page, url):
+        started = time.perf_counter()
+        try:
+            return await scrape_page(page, url)
+        finally:
+            timings.append(time.perf_counter() - started)
+
+    scraper.engine._scrape_page = timed_scrape_page
+    return timings
+
+
+def run_one(server: StandInServer, lean: bool, concurrency: int, url_count: int) -> dict:
+    scraper = PostScraper(concurrency=concurrency, lean=lean, cache_ttl=None)
+    try:
+        started = time.perf_counter()
+        warm_up = scraper.fetch_post_data(server.status_url(0))
+        cold_start = time.perf_counter() - started
+        if not warm_up:
+            raise RuntimeError("Warm-up fetch failed. Is Chromium installed? (playwright install chromium)")
+
+        timings = _time_page_loads(scraper)
+        urls = [server.status_url(i) for i in range(1, url_count + 1)]
+        server.reset_counters()
+        with PeakMemorySampler() as memory:
+            started = time.perf_counter()
+            ok = sum(1 for _, data in scraper.fetch_many(urls) if data)
+            elapsed = time.perf_counter() - started
+    finally:
+        scraper.close()
+
+    return {
+        "mode": "lean" if lean else "full",
+        "concurrency": concurrency,
+        "pages": len(urls),
+        "ok": ok,
+        "cold_start": cold_start,
+        "elapsed": elapsed,
+        "pages_per_sec": len(urls) / elapsed if elapsed > 0 else 0.0,
+        "p50": statistics.median(timings) if timings else None,
+        "p95": statistics.quantiles(timings, n=20)[18] if len(timings) >= 2 else None,
+        "bytes_per_page": server.bytes_sent / len(urls),
+        "peak_rss": memory.peak,
+    }
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.0f}" if seconds is not None else "n/a"
+
+
+def print_results(results, out=sys.stdout):
+    header = f"{'mode':<5} {'conc':>4} {'ok':>7} {'cold(ms)':>9} {'pages/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'KB/page':>8} {'peak MB':>8}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for r in results:
+        peak = f"{r['peak_rss'] / 2**20:.0f}" if r["peak_rss"] is not None else "n/a"
+        print(
+            f"{r['mode']:<5} {r['concurrency']:>4} {r['ok']:>3}/{r['pages']:<3} {_ms(r['cold_start']):>9} "
+            f"{r['pages_per_sec']:>8.2f} {_ms(r['p50']):>8} {_ms(r['p95']):>8} "
+            f"{r['bytes_per_page'] / 1024:>8.0f} {peak:>8}",
+            file=out
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PostScraper against a local X.com stand-in.")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY),
+                        help="Concurrency levels to measure (default 1 2 4 8).")
+    parser.add_argument("-n", "--urls", type=int, default=40, help="Post pages scraped per run (default 40).")
+    parser.add_argument("--modes", nargs="+", choices=("lean", "full"), default=["lean", "full"])
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Stand-in think time per post page, seconds.")
+    parser.add_argument("--asset-latency", type=float, default=0.02, help="Stand-in delay per image/font/script, seconds.")
+    args = parser.parse_args(argv)
+
+    results = []
+    with StandInServer(args.page_latency, args.asset_latency) as server:
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                print(f"Running {mode} x{concurrency}...", file=sys.stderr)
+                results.append(run_one(server, mode == "lean", concurrency, args.urls))
+    print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
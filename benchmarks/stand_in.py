@@ -0,0 +1,154 @@
+# benchmarks/stand_in.py
+"""
+A local stand-in for X.com, so the scraper can be measured without a network.
+
+Post URLs (/<handle>/status/<id>) are answered with one of the recorded tweet
+pages in fixtures/, chosen by id. The pages carry the same data-testid markup
+PostScraper reads, plus the stylesheet, fonts, script, images and video a real
+post page pulls in; those are served as filler bytes of realistic sizes, so
+full and lean scraping differ the way they do on the live site.
+
+Run it on its own to poke at it in a browser:
+    python -m benchmarks.stand_in --port 8765
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Path suffix -> (content type, size in bytes) for the sub-resources the fixtures reference.
+ASSETS = {
+    ".css": ("text/css", 180 * 1024),
+    ".js": ("application/javascript", 400 * 1024),
+    ".woff2": ("font/woff2", 60 * 1024),
+    ".jpg": ("image/jpeg", 120 * 1024),
+    ".mp4": ("video/mp4", 2 * 1024 * 1024),
+}
+
+STATUS_PATH_PATTERN = re.compile(r'^/[^/]+/status/(\d+)/?$')
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR) -> list[bytes]:
+    names = sorted(name for name in os.listdir(fixtures_dir) if name.endswith(".html"))
+    fixtures = []
+    for name in names:
+        with open(os.path.join(fixtures_dir, name), "rb") as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+class StandInServer:
+    """
+    Serves the fixtures on 127.0.0.1 from a background thread. Use as a context manager.
+
+    Args:
+        page_latency: Seconds to wait before answering a post page, like a real server's think time.
+        asset_latency: Seconds to wait before answering each sub-resource.
+        port: 0 picks a free port.
+    """
+    def __init__(self, page_latency: float = 0.05, asset_latency: float = 0.02, port: int = 0):
+        self.page_latency = page_latency
+        self.asset_latency = asset_latency
+        self.fixtures = load_fixtures()
+        self._lock = threading.Lock()
+        self.reset_counters()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def status_url(self, status_id: int) -> str:
+        return f"{self.base_url}/bench_user/status/{status_id}"
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="stand-in-x")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        path = request.path.split("?", 1)[0]
+        match = STATUS_PATH_PATTERN.match(path)
+        if match:
+            body = self.fixtures[int(match.group(1)) % len(self.fixtures)]
+            content_type = "text/html; charset=utf-8"
+            delay = self.page_latency
+        else:
+            asset = next((spec for suffix, spec in ASSETS.items() if path.endswith(suffix)), None)
+            if asset is None:
+                request.send_error(404)
+                return
+            content_type, size = asset
+            body = b"\0" * size
+            delay = self.asset_latency
+
+        if delay:
+            time.sleep(delay)
+        try:
+            request.send_response(200)
+            request.send_header("Content-Type", content_type)
+            request.send_header("Content-Length", str(len(body)))
+            # Like pbs.twimg.com; the benchmark gives every context a cold cache anyway.
+            request.send_header("Cache-Control", "no-store")
+            request.end_headers()
+            request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The browser gave up on it, e.g. a video it only wanted the start of.
+            return
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += len(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded X.com post pages locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--page-latency", type=float, default=0.05)
+    parser.add_argument("--asset-latency", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    with StandInServer(args.page_latency, args.asset_latency, args.port) as server:
+        print(f"Serving {len(server.fixtures)} fixtures; try {server.status_url(1)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
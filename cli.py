@@ -0,0 +1,159 @@
+# cli.py
+"""
+Headless entry point for The Curator's Vault, for scripts and cron jobs.
+
+Examples:
+    python cli.py briefing -o weekly.md --search "rag" --project "General LLM"
+    python cli.py import links.txt --workers 8 --project "General LLM"
+    cat links.txt | python cli.py import -
+    python cli.py backfill-resources --workers 4
+    python cli.py check-plans
+"""
+
+import argparse
+import sys
+from app import database
+from app import file_handler
+from app import importer
+from app import resources
+
+
+def _project_id_for(name):
+    """Returns the id of the project called `name`, or None if there is none."""
+    for project in database.get_all_projects():
+        if project['name'] == name:
+            return project['id']
+    return None
+
+
+def cmd_briefing(args):
+    project_id = None
+    if args.project:
+        project_id = _project_id_for(args.project)
+        if project_id is None:
+            print(f"No project named '{args.project}'.", file=sys.stderr)
+            return 1
+
+    def report(done, total):
+        if not args.quiet:
+            print(f"\r{done}/{total} posts", end="", file=sys.stderr, flush=True)
+
+    success, message = file_handler.write_briefing(args.output, args.search, project_id, on_progress=report)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(message, file=sys.stdout if success else sys.stderr)
+    return 0 if success else 1
+
+
+def cmd_import(args):
+    if args.source == "-":
+        urls = importer.read_urls(sys.stdin)
+    else:
+        with open(args.source, encoding="utf-8") as f:
+            urls = importer.read_urls(f)
+    if not urls:
+        print("No URLs to import.", file=sys.stderr)
+        return 1
+
+    # Imported here so the other commands don't need Playwright installed.
+    from app.scraper import PostScraper
+
+    def report(stats):
+        if not args.quiet:
+            finished = stats["scraped"] + len(stats["failed"])
+            print(f"\r{finished}/{stats['total'] - stats['skipped']} scraped", end="", file=sys.stderr, flush=True)
+
+    # One warm browser, with up to --workers pages loading at once.
+    scraper = PostScraper(concurrency=args.workers, lean=not args.full_pages)
+    try:
+        stats = importer.import_urls(
+            urls, scraper,
+            workers=args.workers, batch_size=args.batch_size,
+            project_name=args.project, category_name=args.category,
+            on_progress=report
+        )
+    finally:
+        scraper.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    print(f"URLs:        {stats['total']}")
+    print(f"Skipped:     {stats['skipped']} (already saved)")
+    print(f"Saved:       {stats['saved']}")
+    print(f"Failed:      {len(stats['failed'])}")
+    print(f"Time:        {stats['elapsed']:.1f}s ({stats['rate']:.2f} posts/s)")
+    for url, reason in stats["failed"]:
+        print(f"  {url}: {reason}", file=sys.stderr)
+    return 0 if not stats["failed"] else 2
+
+
+def cmd_backfill_resources(args):
+    def report(done, total):
+        if not args.quiet:
+            print(f"\r{done}/{total} posts", end="", file=sys.stderr, flush=True)
+
+    stats = resources.backfill_resources(
+        chunk_size=args.chunk_size, workers=args.workers, restart=args.restart, on_progress=report
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    if stats["resumed_from"]:
+        print(f"Resumed after post {stats['resumed_from']}.")
+    print(f"Scanned {stats['scanned']} posts, updated resources on {stats['updated']}.")
+    return 0
+
+
+def cmd_check_plans(args):
+    full_scans = database.check_query_plans()
+    for name, detail in full_scans:
+        print(f"{name}: {detail}")
+    if full_scans:
+        print(f"{len(full_scans)} hot query step(s) scan a whole table or sort a whole page.", file=sys.stderr)
+        return 1
+    print(f"All {len(database.hot_queries())} hot queries use an index.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="The Curator's Vault command-line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    briefing = subparsers.add_parser("briefing", help="Write a markdown briefing without opening the app.")
+    briefing.add_argument("-o", "--output", required=True, help="Path of the markdown file to write.")
+    briefing.add_argument("-s", "--search", help="Only include posts matching this search.")
+    briefing.add_argument("-p", "--project", help="Only include posts in this project.")
+    briefing.add_argument("-q", "--quiet", action="store_true", help="Don't print progress.")
+    briefing.set_defaults(handler=cmd_briefing)
+
+    import_parser = subparsers.add_parser("import", help="Scrape and save a list of X.com post URLs.")
+    import_parser.add_argument("source", nargs="?", default="-", help="File with one URL per line, or '-' for stdin (default).")
+    import_parser.add_argument("-w", "--workers", type=int, default=4, help="URLs scraped at the same time (default 4).")
+    import_parser.add_argument("-b", "--batch-size", type=int, default=50, help="Posts saved per transaction (default 50).")
+    import_parser.add_argument("-p", "--project", help="Project to file the posts under.")
+    import_parser.add_argument("-c", "--category", help="Category to file the posts under.")
+    import_parser.add_argument("--full-pages", action="store_true", help="Load images, fonts and styles too (slower).")
+    import_parser.add_argument("-q", "--quiet", action="store_true", help="Don't print progress.")
+    import_parser.set_defaults(handler=cmd_import)
+
+    backfill = subparsers.add_parser("backfill-resources", help="Re-extract resource links for every saved post.")
+    backfill.add_argument("-w", "--workers", type=int, help="Processes to extract with (default: one per CPU).")
+    backfill.add_argument("--chunk-size", type=int, default=resources.BACKFILL_CHUNK_SIZE,
+                          help=f"Posts read and saved per step (default {resources.BACKFILL_CHUNK_SIZE}).")
+    backfill.add_argument("--restart", action="store_true", help="Start from the first post even if an earlier run was interrupted.")
+    backfill.add_argument("-q", "--quiet", action="store_true", help="Don't print progress.")
+    backfill.set_defaults(handler=cmd_backfill_resources)
+
+    check_plans = subparsers.add_parser("check-plans", help="Fail if a hot query would scan a whole table or sort a whole page.")
+    check_plans.set_defaults(handler=cmd_check_plans)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    database.init_db()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
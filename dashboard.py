@@ -3,20 +3,26 @@
 import sqlite3
 import json
 from flask import Flask, jsonify, render_template, request
-
-# --- Configuration ---
-# Ensure this path is correct, pointing to your database file.
-# It assumes dashboard.py is in the root and the DB is one level down.
-DATABASE_PATH = 'curators_vault.db'
+from app import database
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
 # --- Database Helper ---
 def get_db_connection():
-    """Establishes a connection to the database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    Returns the request thread's connection from the shared connection manager,
+    so the dashboard uses the same WAL/busy-timeout settings as the desktop app.
+    """
+    return database.get_db_connection()
+
+@app.teardown_appcontext
+def close_db_connection(exception=None):
+    """
+    Closes the request's connection. The threaded server runs each request on a new
+    thread, so a per-thread connection is never reused and would otherwise be left
+    for the garbage collector.
+    """
+    database.close_db_connection()
 
 # --- Main Route to Serve the HTML Shell ---
 @app.route('/')
@@ -36,107 +42,185 @@ def get_projects():
     Fetches all projects and calculates live stats for each one.
     """
     conn = get_db_connection()
-    # This query joins projects with posts to get the count and the latest post date.
-    # LEFT JOIN is used to include projects that have 0 posts.
-    projects_rows = conn.execute('''
-        SELECT 
-            p.id, 
-            p.name, 
-            p.description,
-            COUNT(posts.id) as idea_count,
-            MAX(posts.created_at) as last_spark_timestamp
-        FROM projects p
-        LEFT JOIN posts ON posts.project_id = p.id
-        GROUP BY p.id, p.name, p.description
-        ORDER BY last_spark_timestamp DESC, p.name
-    ''').fetchall()
-    conn.close()
+    # Counts each project's posts and finds its latest one; see database.PROJECT_HUB_QUERY.
+    projects_rows = conn.execute(database.PROJECT_HUB_QUERY).fetchall()
     
     projects = [dict(row) for row in projects_rows]
     return jsonify(projects)
 
 # --- Phase 1, Feature 2: The Workshop View API ---
+# Largest page a client may ask for in one request.
+MAX_PAGE_SIZE = 200
+
 @app.route('/api/project/<int:project_id>', methods=['GET'])
 def get_posts_for_project(project_id):
     """
-    Fetches all posts associated with a specific project for the Idea Stream.
+    Fetches one page of posts associated with a specific project for the Idea Stream.
     Includes the new 'resources' and 'avatar_url' fields.
+
+    Query parameters:
+        cursor: The 'next_cursor' from the previous page; omit it for the first page.
+        limit: Posts per page (default database.PAGE_SIZE, at most MAX_PAGE_SIZE).
     """
-    conn = get_db_connection()
-    
-    # Special case for "Uncategorized Ideas" (ID 1) to also include posts with no project
-    if project_id == 1:
-        posts_rows = conn.execute(
-            "SELECT * FROM posts WHERE project_id = ? OR project_id IS NULL ORDER BY created_at DESC", 
-            (project_id,)
-        ).fetchall()
-    else:
-        posts_rows = conn.execute(
-            "SELECT * FROM posts WHERE project_id = ? ORDER BY created_at DESC", 
-            (project_id,)
-        ).fetchall()
-        
-    conn.close()
-    posts = [dict(row) for row in posts_rows]
-    return jsonify(posts)
+    limit = request.args.get('limit', database.PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    try:
+        posts, next_cursor = database.get_posts_page(
+            project_id=project_id, cursor=request.args.get('cursor'), limit=limit
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify({'posts': posts, 'next_cursor': next_cursor})
 
 # --- Phase 1, Feature 3: The Spark Board Persistence API ---
+class LayoutConflict(Exception):
+    """Raised when a layout delta was made against an older version of the board."""
+
 @app.route('/api/project/<int:project_id>/layout', methods=['GET', 'POST'])
 def handle_layout(project_id):
     """
     Handles both fetching and saving the layout for the Spark Board.
+
+    GET returns the sparks, connections and the posts they show, plus the board's
+    'version'. POST takes only what changed since that version:
+
+        {
+            "base_version": 3,
+            "sparks": {
+                "added": [{"id": "new_1", "post_id": 5, "x_pos": 10, "y_pos": 20}],
+                "moved": [{"id": 7, "x_pos": 40, "y_pos": 60}],
+                "removed": [8]
+            },
+            "connections": {
+                "added": [{"start_spark_id": 7, "end_spark_id": "new_1", "label": null}],
+                "removed": [3]
+            }
+        }
+
+    Added sparks carry a temporary frontend id; connections may refer to it. The
+    response maps those to database ids and lists the board's connections with
+    their ids. If the board was saved elsewhere since
+    base_version, nothing is written and the request fails with 409.
     """
     conn = get_db_connection()
     
     if request.method == 'GET':
-        sparks = conn.execute("SELECT * FROM sparks WHERE project_id = ?", (project_id,)).fetchall()
-        connections = conn.execute("SELECT * FROM connections WHERE project_id = ?", (project_id,)).fetchall()
-        conn.close()
+        project = conn.execute("SELECT layout_version FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if project is None:
+            return jsonify({'status': 'error', 'message': 'Project not found.'}), 404
+        sparks = conn.execute(database.BOARD_SPARKS_QUERY, (project_id,)).fetchall()
+        connections = conn.execute(database.BOARD_CONNECTIONS_QUERY, (project_id,)).fetchall()
+        spark_posts = conn.execute(database.BOARD_POSTS_QUERY, (project_id,)).fetchall()
         return jsonify({
+            'version': project['layout_version'],
             'sparks': [dict(row) for row in sparks],
-            'connections': [dict(row) for row in connections]
+            'connections': [dict(row) for row in connections],
+            'posts': [dict(row) for row in spark_posts]
         })
 
     if request.method == 'POST':
-        layout_data = request.get_json()
-        sparks_data = layout_data.get('sparks', [])
-        connections_data = layout_data.get('connections', [])
-        
-        cursor = conn.cursor()
-        
+        delta = request.get_json() or {}
+        try:
+            base_version = int(delta['base_version'])
+            sparks_delta = delta.get('sparks', {})
+            connections_delta = delta.get('connections', {})
+            added_sparks = [
+                (spark['id'], int(spark['post_id']), float(spark['x_pos']), float(spark['y_pos']))
+                for spark in sparks_delta.get('added', [])
+            ]
+            moved_sparks = [
+                (float(spark['x_pos']), float(spark['y_pos']), int(spark['id']), project_id)
+                for spark in sparks_delta.get('moved', [])
+            ]
+            removed_sparks = [(int(spark_id), project_id) for spark_id in sparks_delta.get('removed', [])]
+            added_connections = [
+                (c['start_spark_id'], c['end_spark_id'], c.get('label'))
+                for c in connections_delta.get('added', [])
+            ]
+            removed_connections = [(int(c_id), project_id) for c_id in connections_delta.get('removed', [])]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return jsonify({'status': 'error', 'message': f'Malformed layout delta: {e}'}), 400
+
         # Use a transaction to ensure all or nothing is saved
         try:
-            # Clear the old layout for this project
-            cursor.execute("DELETE FROM connections WHERE project_id = ?", (project_id,))
-            cursor.execute("DELETE FROM sparks WHERE project_id = ?", (project_id,))
-            
-            # Save new sparks and map their old (frontend) ID to their new (database) ID
-            spark_id_map = {}
-            for spark in sparks_data:
+            with database.transaction():
+                cursor = conn.cursor()
+
+                # Claim the next version; if someone else already did, this delta is stale.
                 cursor.execute(
-                    "INSERT INTO sparks (project_id, post_id, x_pos, y_pos) VALUES (?, ?, ?, ?)",
-                    (project_id, spark['post_id'], spark['x_pos'], spark['y_pos'])
+                    "UPDATE projects SET layout_version = layout_version + 1 WHERE id = ? AND layout_version = ?",
+                    (project_id, base_version)
                 )
-                new_spark_id = cursor.lastrowid
-                spark_id_map[spark['id']] = new_spark_id
-
-            # Save new connections using the new database IDs
-            for conn_data in connections_data:
-                start_id = spark_id_map.get(conn_data['start_spark_id'])
-                end_id = spark_id_map.get(conn_data['end_spark_id'])
-                if start_id and end_id:
+                if cursor.rowcount == 0:
+                    raise LayoutConflict()
+
+                # Connections to removed sparks go with them.
+                cursor.executemany('''
+                    DELETE FROM connections
+                    WHERE (start_spark_id = ?1 OR end_spark_id = ?1) AND project_id = ?2
+                ''', removed_sparks)
+                cursor.executemany("DELETE FROM connections WHERE id = ? AND project_id = ?", removed_connections)
+                cursor.executemany("DELETE FROM sparks WHERE id = ? AND project_id = ?", removed_sparks)
+                cursor.executemany("UPDATE sparks SET x_pos = ?, y_pos = ? WHERE id = ? AND project_id = ?", moved_sparks)
+
+                # New sparks are inserted one by one because each lastrowid is needed to map
+                # the frontend's temporary id; boards gain only a few sparks per save.
+                spark_id_map = {}
+                for temp_id, post_id, x_pos, y_pos in added_sparks:
                     cursor.execute(
-                        "INSERT INTO connections (project_id, start_spark_id, end_spark_id, label) VALUES (?, ?, ?, ?)",
-                        (project_id, start_id, end_id, conn_data.get('label'))
+                        "INSERT INTO sparks (project_id, post_id, x_pos, y_pos) VALUES (?, ?, ?, ?)",
+                        (project_id, post_id, x_pos, y_pos)
                     )
-            
-            conn.commit()
-            return jsonify({'status': 'success', 'message': 'Layout saved.'}), 200
+                    spark_id_map[str(temp_id)] = cursor.lastrowid
+
+                def resolve_spark_id(spark_id):
+                    if str(spark_id) in spark_id_map:
+                        return spark_id_map[str(spark_id)]
+                    return int(spark_id)
+
+                # Only connect sparks that are (still) on this project's board.
+                board_spark_ids = {
+                    row['id'] for row in cursor.execute("SELECT id FROM sparks WHERE project_id = ?", (project_id,))
+                }
+                connection_rows = []
+                for start_id, end_id, label in added_connections:
+                    start_id, end_id = resolve_spark_id(start_id), resolve_spark_id(end_id)
+                    if start_id in board_spark_ids and end_id in board_spark_ids:
+                        connection_rows.append((project_id, start_id, end_id, label))
+                cursor.executemany(
+                    "INSERT INTO connections (project_id, start_spark_id, end_spark_id, label) VALUES (?, ?, ?, ?)",
+                    connection_rows
+                )
+
+                # The client matches its new connector lines to these ids by their endpoints.
+                connections = cursor.execute(
+                    "SELECT id, start_spark_id, end_spark_id FROM connections WHERE project_id = ?", (project_id,)
+                ).fetchall()
+                version = cursor.execute(
+                    "SELECT layout_version FROM projects WHERE id = ?", (project_id,)
+                ).fetchone()['layout_version']
+
+            return jsonify({
+                'status': 'success',
+                'message': 'Layout saved.',
+                'version': version,
+                'spark_ids': spark_id_map,
+                'connections': [dict(row) for row in connections]
+            }), 200
+        except LayoutConflict:
+            current = conn.execute("SELECT layout_version FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if current is None:
+                return jsonify({'status': 'error', 'message': 'Project not found.'}), 404
+            return jsonify({
+                'status': 'conflict',
+                'message': 'This board was changed somewhere else. Reload it before saving.',
+                'version': current['layout_version']
+            }), 409
+        except (ValueError, TypeError) as e:
+            return jsonify({'status': 'error', 'message': f'Malformed layout delta: {e}'}), 400
         except Exception as e:
-            conn.rollback()
             return jsonify({'status': 'error', 'message': str(e)}), 500
-        finally:
-            conn.close()
 
 # --- Optional: API to create a new project from the dashboard ---
 @app.route('/api/projects/new', methods=['POST'])
@@ -148,17 +232,14 @@ def create_project():
     if not name:
         return jsonify({'status': 'error', 'message': 'Project name is required.'}), 400
 
-    conn = get_db_connection()
     try:
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO projects (name, description) VALUES (?, ?)", (name, description))
-        new_project_id = cursor.lastrowid
-        conn.commit()
+        with database.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO projects (name, description) VALUES (?, ?)", (name, description))
+            new_project_id = cursor.lastrowid
         return jsonify({'status': 'success', 'id': new_project_id, 'name': name}), 201
     except sqlite3.IntegrityError:
         return jsonify({'status': 'error', 'message': 'A project with this name already exists.'}), 409
-    finally:
-        conn.close()
 
 
 if __name__ == '__main__':
@@ -1,25 +1,36 @@
 print("Main Window Refactor")
 
+import sys
+from app import startup_timing
+
+# python main.py --startup-timing: print where startup time went, then close.
+startup_timing.enabled = "--startup-timing" in sys.argv
+
 import customtkinter
+startup_timing.mark("import customtkinter")
 from app.database import init_db
 from app.main_window import MainWindow
 from app.assets import load_assets
+startup_timing.mark("import app modules")
 
 # UI Configuration
 customtkinter.set_appearance_mode("dark")
 customtkinter.set_default_color_theme("theme.json")
+startup_timing.mark("load theme")
 
 
 class App(customtkinter.CTk):
     def __init__(self):
         super().__init__()
+        startup_timing.mark("create Tk root")
 
         self.assets = load_assets()
+        startup_timing.mark("load assets")
 
         # Configure the main window
         self.title("The Curator's Vault - v1.0") # Final Version!
         self.geometry("1200x720") # A slightly larger default size
-        
+
         # --- NEW: Set a minimum size for the window ---
         self.minsize(900, 600)
 
@@ -30,10 +41,28 @@ class App(customtkinter.CTk):
         # Create and place the main UI frame
         self.main_frame = MainWindow(master=self, assets=self.assets)
         self.main_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        startup_timing.mark("build main window and load posts")
+
+        # Shut the scraper's browser down cleanly instead of leaving them to die with the process.
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        if startup_timing.enabled:
+            self.after_idle(self._report_startup)
+
+    def _report_startup(self):
+        self.update_idletasks()
+        startup_timing.mark("first draw")
+        startup_timing.report()
+        self.on_close()
+
+    def on_close(self):
+        self.main_frame.shutdown()
+        self.destroy()
 
 
 if __name__ == "__main__":
     init_db()
-    
+    startup_timing.mark("open database")
+
     app = App()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
@@ -5,12 +5,17 @@ document.addEventListener('DOMContentLoaded', () => {
     const appContainer = document.getElementById('app-container');
     const header = document.querySelector('header');
     let currentConnections = []; // Holds all Leader-Line instances
+    let ideaStreamObserver = null; // Loads the next page of ideas when the stream is scrolled to the end
 
     // --- Router ---
     function navigate() {
         const hash = window.location.hash;
         currentConnections.forEach(line => line.remove());
         currentConnections = [];
+        if (ideaStreamObserver) {
+            ideaStreamObserver.disconnect();
+            ideaStreamObserver = null;
+        }
 
         if (hash.startsWith('#project-')) {
             const projectId = hash.substring('#project-'.length);
@@ -84,7 +89,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             if (!postsResponse.ok || !projectsResponse.ok || !layoutResponse.ok) throw new Error('Failed to fetch workshop data');
             
-            const posts = await postsResponse.json();
+            const firstPage = await postsResponse.json();
             const projects = await projectsResponse.json();
             const layout = await layoutResponse.json();
             const currentProject = projects.find(p => p.id == projectId);
@@ -113,25 +118,36 @@ document.addEventListener('DOMContentLoaded', () => {
             const sparkBoardCanvas = document.querySelector('.spark-board-canvas');
             const resourceListContainer = document.getElementById('resource-list-container');
 
-            if (posts.length === 0) {
+            if (firstPage.posts.length === 0) {
                 ideaStreamContainer.innerHTML = '<p class="placeholder-text">No ideas saved for this project yet.</p>';
             } else {
-                posts.forEach(post => {
-                    const ideaCard = createIdeaCard(post, resourceListContainer);
-                    ideaStreamContainer.appendChild(ideaCard);
-                });
+                appendIdeaCards(ideaStreamContainer, firstPage.posts, resourceListContainer);
+                setupIdeaStreamPaging(ideaStreamContainer, projectId, firstPage.next_cursor, resourceListContainer);
             }
 
+            // The layout carries the posts its sparks point at, since they may not be on the first page.
+            const sparkPosts = new Map(layout.posts.map(post => [post.id, post]));
+            // What the server last saved, so a save only sends what changed since then.
+            const board = {
+                projectId,
+                version: layout.version,
+                savedSparks: new Map(),      // spark id -> { x_pos, y_pos } as last saved
+                removedSparkIds: new Set(),
+                connectionIds: new Map(),    // LeaderLine -> saved connection id
+                removedConnectionIds: new Set()
+            };
+
             const sparkNotes = new Map();
             if (layout.sparks.length > 0) {
                 layout.sparks.forEach(spark => {
-                    const postData = posts.find(p => p.id === spark.post_id);
+                    const postData = sparkPosts.get(spark.post_id);
                     if (postData) {
                         const stickyNote = createStickyNote(spark.id, postData, resourceListContainer);
                         stickyNote.style.left = `${spark.x_pos}px`;
                         stickyNote.style.top = `${spark.y_pos}px`;
                         sparkBoardCanvas.appendChild(stickyNote);
                         sparkNotes.set(spark.id, stickyNote);
+                        board.savedSparks.set(String(spark.id), { x_pos: spark.x_pos, y_pos: spark.y_pos });
                     }
                 });
             } else {
@@ -149,11 +165,12 @@ document.addEventListener('DOMContentLoaded', () => {
                             path: 'fluid' 
                         });
                         currentConnections.push(line);
+                        board.connectionIds.set(line, conn.id);
                     }
                 });
             }
 
-            setupSparkBoard(sparkBoardCanvas, posts, resourceListContainer);
+            setupSparkBoard(sparkBoardCanvas, board, resourceListContainer);
             
         } catch (error) {
             console.error(`Failed to load workshop for project ${projectId}:`, error);
@@ -161,6 +178,58 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
     
+    // --- Idea Stream Paging ---
+    function appendIdeaCards(container, posts, resourceContainer, before = null) {
+        const fragment = document.createDocumentFragment();
+        posts.forEach(post => fragment.appendChild(createIdeaCard(post, resourceContainer)));
+        container.insertBefore(fragment, before);
+    }
+
+    function setupIdeaStreamPaging(container, projectId, nextCursor, resourceContainer) {
+        if (!nextCursor) return;
+
+        // A sentinel at the end of the stream; when it scrolls into view, the next page is fetched.
+        const sentinel = document.createElement('p');
+        sentinel.className = 'placeholder-text idea-stream-sentinel';
+        sentinel.textContent = 'Loading more ideas...';
+        container.appendChild(sentinel);
+
+        let cursor = nextCursor;
+        let loading = false;
+        const observer = new IntersectionObserver(async (entries) => {
+            if (loading || !entries.some(entry => entry.isIntersecting)) return;
+            loading = true;
+            try {
+                const response = await fetch(`/api/project/${projectId}?cursor=${encodeURIComponent(cursor)}`);
+                if (!response.ok) throw new Error(`Server error: ${response.status}`);
+                const page = await response.json();
+                if (observer !== ideaStreamObserver) return; // The user navigated away meanwhile
+
+                appendIdeaCards(container, page.posts, resourceContainer, sentinel);
+
+                cursor = page.next_cursor;
+                if (!cursor) {
+                    observer.disconnect();
+                    sentinel.remove();
+                } else {
+                    // Re-observing reports the sentinel's current state, so a page too short
+                    // to push it out of view still triggers the next fetch.
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                }
+            } catch (error) {
+                console.error(`Failed to load more ideas for project ${projectId}:`, error);
+                sentinel.textContent = 'Could not load more ideas.';
+                observer.disconnect();
+            } finally {
+                loading = false;
+            }
+        }, { root: container, rootMargin: '200px' });
+
+        observer.observe(sentinel);
+        ideaStreamObserver = observer;
+    }
+
     // --- Component Creation & Update Functions ---
     function createIdeaCard(post, resourceContainer) {
         const card = document.createElement('div');
@@ -293,8 +362,9 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // --- Interactivity Setup ---
-    function setupSparkBoard(canvas, posts, resourceContainer) {
+    function setupSparkBoard(canvas, board, resourceContainer) {
         let line_in_progress = null;
+        const draggables = new Map(); // sticky note -> PlainDraggable
 
         // --- THE FIX: Define the options for the line being dragged ---
         const lineInProgressOptions = {
@@ -304,13 +374,17 @@ document.addEventListener('DOMContentLoaded', () => {
             dropShadow: true
         };
 
-        // Make existing notes draggable and reposition lines
-        canvas.querySelectorAll('.sticky-note').forEach(note => {
-            new PlainDraggable(note, { 
+        // leftTop keeps style.left/top in sync while dragging, which is what a save reads.
+        function makeDraggable(note) {
+            draggables.set(note, new PlainDraggable(note, {
                 containment: canvas,
+                leftTop: true,
                 onMove: () => currentConnections.forEach(line => line.position())
-            });
-        });
+            }));
+        }
+
+        // Make existing notes draggable and reposition lines
+        canvas.querySelectorAll('.sticky-note').forEach(makeDraggable);
 
         canvas.addEventListener('dragover', (event) => event.preventDefault());
         canvas.addEventListener('drop', (event) => {
@@ -324,15 +398,35 @@ document.addEventListener('DOMContentLoaded', () => {
             stickyNote.style.top = `${event.clientY - boardRect.top - 50}px`;
 
             canvas.appendChild(stickyNote);
-            new PlainDraggable(stickyNote, { 
-                containment: canvas,
-                onMove: () => currentConnections.forEach(line => line.position())
-            });
+            makeDraggable(stickyNote);
 
             const placeholder = canvas.querySelector('.spark-board-placeholder');
             if (placeholder) placeholder.remove();
         });
 
+        // Right-click a note to take it (and its connectors) off the board.
+        canvas.addEventListener('contextmenu', (event) => {
+            const note = event.target.closest('.sticky-note');
+            if (!note) return;
+            event.preventDefault();
+
+            currentConnections = currentConnections.filter(line => {
+                if (line.start !== note && line.end !== note) return true;
+                if (board.connectionIds.has(line)) {
+                    board.removedConnectionIds.add(board.connectionIds.get(line));
+                    board.connectionIds.delete(line);
+                }
+                line.remove();
+                return false;
+            });
+            if (board.savedSparks.has(note.dataset.sparkId)) {
+                board.removedSparkIds.add(note.dataset.sparkId);
+            }
+            draggables.get(note)?.remove();
+            draggables.delete(note);
+            note.remove();
+        });
+
         // --- THE FIX: Use event delegation on the canvas for mousedown ---
         canvas.addEventListener('mousedown', (event) => {
             if (event.target.classList.contains('connector-handle')) {
@@ -376,51 +470,106 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         const saveButton = document.querySelector('.save-layout-button');
+
+        function showSaveResult(text, delay, then) {
+            saveButton.textContent = text;
+            setTimeout(() => {
+                saveButton.textContent = 'Save Layout';
+                saveButton.classList.remove('saving');
+                if (then) then();
+            }, delay);
+        }
+
         saveButton.addEventListener('click', async () => {
-            saveButton.textContent = 'Saving...';
-            saveButton.classList.add('saving');
+            if (saveButton.classList.contains('saving')) return;
 
-            const sparksToSave = [];
+            // --- Work out what changed since the last save ---
+            const addedSparks = [];
+            const movedSparks = [];
             canvas.querySelectorAll('.sticky-note').forEach(note => {
-                sparksToSave.push({
+                const spark = {
                     id: note.dataset.sparkId,
-                    post_id: note.dataset.postId,
                     x_pos: parseFloat(note.style.left),
                     y_pos: parseFloat(note.style.top)
-                });
-            });
-
-            const connectionsToSave = [];
-            currentConnections.forEach(line => {
-                if (line.start && line.end) { // Ensure the line is valid
-                    connectionsToSave.push({
-                        start_spark_id: line.start.dataset.sparkId,
-                        end_spark_id: line.end.dataset.sparkId,
-                        label: null
-                    });
+                };
+                const saved = board.savedSparks.get(spark.id);
+                if (!saved) {
+                    addedSparks.push({ ...spark, post_id: note.dataset.postId });
+                } else if (saved.x_pos !== spark.x_pos || saved.y_pos !== spark.y_pos) {
+                    movedSparks.push(spark);
                 }
             });
 
-            const layoutPayload = {
-                sparks: sparksToSave,
-                connections: connectionsToSave
+            const newLines = currentConnections.filter(line => !board.connectionIds.has(line) && line.start && line.end);
+            const addedConnections = newLines.map(line => ({
+                start_spark_id: line.start.dataset.sparkId,
+                end_spark_id: line.end.dataset.sparkId,
+                label: null
+            }));
+
+            const removedSparkIds = [...board.removedSparkIds];
+            const removedConnectionIds = [...board.removedConnectionIds];
+            const unchanged = !addedSparks.length && !movedSparks.length && !removedSparkIds.length
+                && !addedConnections.length && !removedConnectionIds.length;
+            if (unchanged) {
+                saveButton.classList.add('saving');
+                showSaveResult('No changes', 1000);
+                return;
+            }
+
+            const layoutDelta = {
+                base_version: board.version,
+                sparks: { added: addedSparks, moved: movedSparks, removed: removedSparkIds },
+                connections: { added: addedConnections, removed: removedConnectionIds }
             };
 
-            const projectId = window.location.hash.substring('#project-'.length);
+            saveButton.textContent = 'Saving...';
+            saveButton.classList.add('saving');
             try {
-                const response = await fetch(`/api/project/${projectId}/layout`, {
+                const response = await fetch(`/api/project/${board.projectId}/layout`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(layoutPayload)
+                    body: JSON.stringify(layoutDelta)
                 });
+                if (response.status === 409) {
+                    // Another tab saved first; reload rather than overwrite its changes.
+                    showSaveResult('Changed elsewhere, reloading...', 1500, navigate);
+                    return;
+                }
                 if (!response.ok) throw new Error('Save failed');
-                navigate(); 
+                const result = await response.json();
+
+                // --- Fold the saved delta into our baseline ---
+                addedSparks.forEach(spark => {
+                    const newId = String(result.spark_ids[spark.id]);
+                    const note = canvas.querySelector(`.sticky-note[data-spark-id="${spark.id}"]`);
+                    if (note) note.dataset.sparkId = newId;
+                    board.savedSparks.set(newId, { x_pos: spark.x_pos, y_pos: spark.y_pos });
+                });
+                movedSparks.forEach(spark => board.savedSparks.set(spark.id, { x_pos: spark.x_pos, y_pos: spark.y_pos }));
+                removedSparkIds.forEach(id => {
+                    board.savedSparks.delete(id);
+                    board.removedSparkIds.delete(id);
+                });
+                removedConnectionIds.forEach(id => board.removedConnectionIds.delete(id));
+
+                // Match the new lines to their connection ids by endpoints.
+                const knownIds = new Set(board.connectionIds.values());
+                const unclaimed = new Map();
+                result.connections.filter(conn => !knownIds.has(conn.id)).forEach(conn => {
+                    const key = `${conn.start_spark_id}-${conn.end_spark_id}`;
+                    if (!unclaimed.has(key)) unclaimed.set(key, []);
+                    unclaimed.get(key).push(conn.id);
+                });
+                newLines.forEach(line => {
+                    const ids = unclaimed.get(`${line.start.dataset.sparkId}-${line.end.dataset.sparkId}`);
+                    if (ids && ids.length) board.connectionIds.set(line, ids.shift());
+                });
+
+                board.version = result.version;
+                showSaveResult('Saved', 1000);
             } catch (error) {
-                saveButton.textContent = 'Save Failed!';
-                setTimeout(() => {
-                    saveButton.textContent = 'Save Layout';
-                    saveButton.classList.remove('saving');
-                }, 2000);
+                showSaveResult('Save Failed!', 2000);
             }
         });
     }
@@ -0,0 +1,15 @@
+# tests/conftest.py
+
+import pytest
+
+from app import database
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    """Points the app at a fresh, migrated vault in a temporary file instead of curators_vault.db."""
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "vault.db"))
+    database.init_db()
+    yield tmp_path / "vault.db"
+    database.close_db_connection()
+    database.invalidate_lookup_cache()
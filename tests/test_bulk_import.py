@@ -0,0 +1,63 @@
+# tests/test_bulk_import.py
+
+from app import database
+
+
+def post_texts():
+    return sorted(post['post_text'] for post in database.get_all_posts())
+
+
+def test_mixed_batch_keeps_the_good_records_and_reports_the_rest_by_position(vault):
+    records = [
+        {"post_text": "first"},
+        "not a dict",
+        {"post_text": "second", "project_name": "Research"},
+        {"post_text": "   "},
+        {"post_text": "third", "project_name": 42},
+        {"author": "no text"},
+        {"post_text": "fourth", "category_name": ["Papers"]},
+        {"post_text": "fifth", "category_name": "Papers"},
+    ]
+    inserted, errors = database.add_posts_bulk(records)
+
+    assert inserted == 3
+    assert [index for index, _ in errors] == [1, 3, 4, 5, 6]
+    assert post_texts() == ["fifth", "first", "second"]
+
+
+def test_rows_the_database_rejects_are_isolated_from_the_batch(vault):
+    # sqlite3 can't bind a dict, so executemany fails and each row is retried on its own.
+    records = [{"post_text": "a"}, {"post_text": "b", "notes": {"not": "bindable"}}, {"post_text": "c"}]
+    inserted, errors = database.add_posts_bulk(records)
+
+    assert inserted == 2
+    assert [index for index, _ in errors] == [1]
+    assert post_texts() == ["a", "c"]
+
+
+def test_project_and_category_names_are_created_once(vault):
+    database.add_post("", "existing", "", "", "Papers", "Research", None)
+    records = [
+        {"post_text": "a", "project_name": "Research", "category_name": "Papers"},
+        {"post_text": "b", "project_name": "New Project", "category_name": "Tools"},
+        {"post_text": "c", "project_name": "New Project", "category_name": "Tools"},
+        {"post_text": "d", "project_name": "  ", "category_name": ""},
+    ]
+    inserted, errors = database.add_posts_bulk(records)
+
+    assert (inserted, errors) == (4, [])
+    conn = database.get_db_connection()
+    assert [row['name'] for row in conn.execute("SELECT name FROM projects ORDER BY id")] == [
+        "Uncategorized Ideas", "Research", "New Project"
+    ]
+    assert [row['name'] for row in conn.execute("SELECT name FROM categories ORDER BY id")] == ["Papers", "Tools"]
+    projects = {post['post_text']: post['project_name'] for post in database.get_all_posts()}
+    assert projects["d"] == "Uncategorized Ideas"
+    assert projects["b"] == projects["c"] == "New Project"
+
+
+def test_empty_or_all_invalid_batch_writes_nothing(vault):
+    assert database.add_posts_bulk([]) == (0, [])
+    inserted, errors = database.add_posts_bulk([{"post_text": ""}])
+    assert inserted == 0 and [index for index, _ in errors] == [0]
+    assert database.count_posts() == 0
@@ -0,0 +1,144 @@
+# tests/test_dashboard.py
+
+import pytest
+
+import dashboard
+from app import database
+
+
+@pytest.fixture
+def client(vault):
+    dashboard.app.config["TESTING"] = True
+    with dashboard.app.test_client() as client:
+        yield client
+
+
+def test_request_closes_its_connection(client):
+    response = client.get("/api/projects")
+    assert response.status_code == 200
+    assert response.get_json()[0]["name"] == "Uncategorized Ideas"
+    assert database._local.conn is None
+
+
+def test_project_posts_are_paged_with_a_cursor(client):
+    for i in range(5):
+        database.add_post("", f"post {i}", "", "", None, "Research", None)
+    first = client.get("/api/project/2?limit=3").get_json()
+    second = client.get(f"/api/project/2?limit=3&cursor={first['next_cursor']}").get_json()
+    assert second["next_cursor"] is None
+    ids = [post["id"] for post in first["posts"] + second["posts"]]
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 5
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "e30", "WyJhIiwgImIiXQ"])
+def test_bad_cursor_is_a_400(client, cursor):
+    response = client.get(f"/api/project/1?cursor={cursor}")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+@pytest.fixture
+def board(client):
+    """Project 2 with three posts and an empty Spark Board; returns the post ids."""
+    for i in range(3):
+        database.add_post("", f"idea {i}", "", "", None, "Board", None)
+    return [post["id"] for post in database.get_all_posts(project_id=2)]
+
+
+def get_layout(client):
+    response = client.get("/api/project/2/layout")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def save_layout(client, delta):
+    return client.post("/api/project/2/layout", json=delta)
+
+
+def edges(layout):
+    return {(c["start_spark_id"], c["end_spark_id"]) for c in layout["connections"]}
+
+
+def test_added_sparks_get_ids_and_connections_between_them(client, board):
+    version = get_layout(client)["version"]
+    response = save_layout(client, {
+        "base_version": version,
+        "sparks": {"added": [
+            {"id": "new_1", "post_id": board[0], "x_pos": 10, "y_pos": 20},
+            {"id": "new_2", "post_id": board[1], "x_pos": 30, "y_pos": 40},
+        ]},
+        "connections": {"added": [{"start_spark_id": "new_1", "end_spark_id": "new_2", "label": "leads to"}]},
+    })
+    assert response.status_code == 200
+    saved = response.get_json()
+    assert saved["version"] == version + 1
+    ids = saved["spark_ids"]
+    assert set(ids) == {"new_1", "new_2"}
+    assert edges(saved) == {(ids["new_1"], ids["new_2"])}
+
+    layout = get_layout(client)
+    assert layout["version"] == version + 1
+    assert {spark["id"]: spark["post_id"] for spark in layout["sparks"]} == {ids["new_1"]: board[0], ids["new_2"]: board[1]}
+    assert edges(layout) == {(ids["new_1"], ids["new_2"])}
+    assert {post["id"] for post in layout["posts"]} == {board[0], board[1]}
+
+
+def test_moved_and_removed_sparks(client, board):
+    saved = save_layout(client, {
+        "base_version": get_layout(client)["version"],
+        "sparks": {"added": [
+            {"id": f"new_{i}", "post_id": post_id, "x_pos": 0, "y_pos": 0} for i, post_id in enumerate(board)
+        ]},
+        "connections": {"added": [
+            {"start_spark_id": "new_0", "end_spark_id": "new_1"},
+            {"start_spark_id": "new_1", "end_spark_id": "new_2"},
+        ]},
+    }).get_json()
+    ids = saved["spark_ids"]
+
+    response = save_layout(client, {
+        "base_version": saved["version"],
+        "sparks": {"moved": [{"id": ids["new_0"], "x_pos": 50, "y_pos": 60}], "removed": [ids["new_2"]]},
+    })
+    assert response.status_code == 200
+    assert response.get_json()["version"] == saved["version"] + 1
+
+    layout = get_layout(client)
+    positions = {spark["id"]: (spark["x_pos"], spark["y_pos"]) for spark in layout["sparks"]}
+    assert positions == {ids["new_0"]: (50, 60), ids["new_1"]: (0, 0)}
+    # The connection to the removed spark went with it.
+    assert edges(layout) == {(ids["new_0"], ids["new_1"])}
+
+
+def test_stale_base_version_is_a_409_and_writes_nothing(client, board):
+    version = get_layout(client)["version"]
+    save_layout(client, {"base_version": version, "sparks": {"added": [{"id": "a", "post_id": board[0], "x_pos": 0, "y_pos": 0}]}})
+
+    response = save_layout(client, {
+        "base_version": version,
+        "sparks": {"added": [{"id": "b", "post_id": board[1], "x_pos": 0, "y_pos": 0}]},
+    })
+    assert response.status_code == 409
+    assert response.get_json()["version"] == version + 1
+    layout = get_layout(client)
+    assert layout["version"] == version + 1
+    assert [spark["post_id"] for spark in layout["sparks"]] == [board[0]]
+
+
+@pytest.mark.parametrize("delta", [
+    {},
+    {"base_version": "three"},
+    {"base_version": 0, "sparks": {"added": [{"id": "a", "post_id": "five", "x_pos": 0, "y_pos": 0}]}},
+    {"base_version": 0, "sparks": {"moved": [{"id": 1}]}},
+    {"base_version": 0, "sparks": ["not", "a", "delta"]},
+    # Caught only once the transaction has begun: it must still roll back.
+    {"base_version": 0,
+     "sparks": {"added": [{"id": "a", "post_id": 1, "x_pos": 0, "y_pos": 0}]},
+     "connections": {"added": [{"start_spark_id": "a", "end_spark_id": "nowhere"}]}},
+])
+def test_malformed_delta_is_a_400_and_writes_nothing(client, board, delta):
+    before = get_layout(client)
+    assert before["version"] == 0
+    response = save_layout(client, delta)
+    assert response.status_code == 400
+    assert get_layout(client) == before
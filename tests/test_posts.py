@@ -0,0 +1,59 @@
+# tests/test_posts.py
+
+from app import database
+
+
+def test_posts_without_a_project_move_to_uncategorized_ideas(vault):
+    database.add_post("a (@a)", "kept", "", "https://x.com/a/status/1", None, "Other", None)
+    with database.transaction() as conn:
+        conn.execute("INSERT INTO posts (author, post_text) VALUES (?, ?)", ("b (@b)", "from before projects"))
+        conn.execute("PRAGMA user_version = 0")
+
+    database.init_db()
+
+    posts, _ = database.get_posts_page(project_id=1)
+    assert [post['post_text'] for post in posts] == ["from before projects"]
+    assert database.count_posts(project_id=1) + database.count_posts(project_id=2) == database.count_posts()
+
+
+def add_posts(count):
+    """Adds posts with several to a timestamp, so pages break inside runs of equal created_at."""
+    for i in range(count):
+        # The word count varies, so the search scores vary and tie too.
+        text = "graph " * (1 + i % 4) + f"post {i}"
+        database.add_post(f"a{i} (@a{i})", text, "", f"https://x.com/a/status/{i}", None, "Research" if i % 3 else None, None)
+    with database.transaction() as conn:
+        conn.execute("UPDATE posts SET created_at = datetime('2024-01-01', '+' || (id / 4) || ' minutes')")
+
+
+def walk_pages(limit, **filters):
+    seen, cursor = [], None
+    while True:
+        posts, cursor = database.get_posts_page(cursor=cursor, limit=limit, **filters)
+        seen.extend(post['id'] for post in posts)
+        if cursor is None:
+            return seen
+
+
+def test_pages_cover_the_list_once_in_order(vault):
+    add_posts(37)
+    for filters in ({}, {"project_id": 1}, {"project_id": 2}):
+        expected = [post['id'] for post in database.get_all_posts(**filters)]
+        assert expected
+        assert walk_pages(5, **filters) == expected
+
+
+def test_search_pages_cover_the_matches_once_in_relevance_order(vault):
+    add_posts(37)
+    expected = [post['id'] for post in database.get_all_posts("graph")]
+    assert len(expected) == 37
+    assert walk_pages(4, search_term="graph") == expected
+    assert walk_pages(4, search_term="graph", project_id=2) == [
+        post['id'] for post in database.get_all_posts("graph", project_id=2)
+    ]
+
+
+def test_last_page_ends_exactly_at_the_end(vault):
+    add_posts(10)
+    posts, cursor = database.get_posts_page(limit=10)
+    assert len(posts) == 10 and cursor is None
@@ -0,0 +1,44 @@
+# tests/test_query_plans.py
+"""
+Checks that the queries behind the post list, the dashboard and the scrape queue
+are answered from an index, never by reading all of posts, sparks or connections.
+
+    python -m pytest tests
+"""
+
+import pytest
+
+from app import database
+
+HOT_QUERIES = database.hot_queries()
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(name):
+    assert database.check_query_plans({name: HOT_QUERIES[name]}) == []
+
+
+def test_every_post_list_variant_is_checked():
+    # One get_all_posts() query and two get_posts_page() queries per search/project combination.
+    post_queries = [name for name in HOT_QUERIES if name.startswith("posts(")]
+    assert len(post_queries) == 2 * 3 * 3
+
+
+@pytest.mark.parametrize("table", ["posts", "sparks", "connections"])
+def test_full_scan_is_reported(table):
+    # An unindexed filter, to show the check can fail.
+    column = {"posts": "notes", "sparks": "x_pos", "connections": "end_spark_id + 0"}[table]
+    full_scans = database.check_query_plans({"unindexed": (f"SELECT * FROM {table} WHERE {column} = ?", (1,))})
+    assert full_scans == [("unindexed", f"SCAN {table}")]
+
+
+def test_plain_post_list_pages_are_index_ordered():
+    paged = [name for name, (_, _, index_ordered) in HOT_QUERIES.items() if index_ordered and name.startswith("posts(")]
+    assert len(paged) == 2 * 3
+
+
+def test_page_that_sorts_everything_it_matches_is_reported():
+    # The old Uncategorized Ideas filter: each side is indexed, but the union has to be sorted.
+    query = "SELECT id FROM posts WHERE project_id = ? OR project_id IS NULL ORDER BY created_at DESC, id DESC LIMIT ?"
+    assert database.check_query_plans({"unsorted": (query, (1, 50))}) == []
+    assert database.check_query_plans({"paged": (query, (1, 50), True)}) == [("paged", "USE TEMP B-TREE FOR ORDER BY")]
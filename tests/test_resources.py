@@ -0,0 +1,36 @@
+# tests/test_resources.py
+
+import json
+
+from app.resources import extract_resources
+
+
+def links(text):
+    resources = extract_resources(text)
+    return json.loads(resources) if resources else []
+
+
+def test_keeps_resource_links_and_drops_others():
+    text = "Code at https://github.com/a/b, paper https://arxiv.org/abs/1234.5678. Also https://example.com/x"
+    assert links(text) == ["https://github.com/a/b", "https://arxiv.org/abs/1234.5678"]
+
+
+def test_subdomains_of_resource_hosts_count():
+    text = "https://gist.github.com/a/1 https://WWW.GitHub.com/a https://colab.research.google.com/drive/1"
+    assert links(text) == ["https://gist.github.com/a/1", "https://WWW.GitHub.com/a", "https://colab.research.google.com/drive/1"]
+
+
+def test_lookalike_hosts_are_not_resources():
+    text = "https://notgithub.com/a https://github.com.evil.example/a https://google.com/x"
+    assert links(text) == []
+
+
+def test_malformed_urls_are_skipped():
+    text = "https://[fe80::1 and https://[::1]:99999/x then https://github.com/a/b"
+    assert links(text) == ["https://github.com/a/b"]
+
+
+def test_duplicates_are_dropped_and_no_links_is_none():
+    assert links("https://github.com/a https://github.com/a") == ["https://github.com/a"]
+    assert extract_resources("") is None
+    assert extract_resources(None) is None
@@ -0,0 +1,80 @@
+# tests/test_scrape_queue.py
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from app import database, scrape_queue
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class FakeScraper:
+    """Resolves every scrape at once, on a thread of its own like the real event loop."""
+    def submit(self, url, raise_errors=False):
+        future = Future()
+        threading.Thread(target=future.set_result, args=({"post_text": url},)).start()
+        return future
+
+
+def test_jobs_are_scraped_and_recorded(vault):
+    worker = scrape_queue.ScrapeQueueWorker(FakeScraper, poll_interval=0.1).start()
+    try:
+        job_ids = worker.enqueue(["https://x.com/a/status/1", "https://x.com/a/status/2"])
+        assert wait_for(lambda: database.count_scrape_jobs() == {database.JOB_DONE: 2})
+        assert database.get_scrape_job(job_ids[0])['result'] == {"post_text": "https://x.com/a/status/1"}
+    finally:
+        worker.stop()
+
+
+def test_scraper_that_cannot_start_fails_the_job_and_the_worker_lives_on(vault, monkeypatch):
+    monkeypatch.setattr(scrape_queue, "RETRY_BASE_DELAY", 0.3)
+    scraper = None
+
+    def get_scraper():
+        if scraper is None:
+            raise RuntimeError("Playwright is not installed")
+        return scraper
+
+    worker = scrape_queue.ScrapeQueueWorker(get_scraper, poll_interval=0.1).start()
+    try:
+        [job_id] = worker.enqueue(["https://x.com/a/status/1"])
+        assert wait_for(lambda: database.get_scrape_job(job_id)['last_error'] is not None)
+        job = database.get_scrape_job(job_id)
+        assert job['status'] == database.JOB_QUEUED
+        assert "Playwright is not installed" in job['last_error']
+        assert worker._in_flight == 0
+
+        # The retry, once it is due, goes through.
+        scraper = FakeScraper()
+        assert wait_for(lambda: database.get_scrape_job(job_id)['status'] == database.JOB_DONE)
+    finally:
+        worker.stop()
+
+
+def test_database_errors_do_not_stop_the_worker(vault, monkeypatch):
+    claim = database.claim_scrape_job
+    failures = []
+
+    def locked_once():
+        if not failures:
+            failures.append(True)
+            raise sqlite3.OperationalError("database is locked")
+        return claim()
+
+    monkeypatch.setattr(database, "claim_scrape_job", locked_once)
+    worker = scrape_queue.ScrapeQueueWorker(FakeScraper, poll_interval=0.1).start()
+    try:
+        [job_id] = worker.enqueue(["https://x.com/a/status/1"])
+        assert wait_for(lambda: database.get_scrape_job(job_id)['status'] == database.JOB_DONE)
+        assert failures and worker._thread.is_alive()
+    finally:
+        worker.stop()
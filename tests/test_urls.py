@@ -0,0 +1,28 @@
+# tests/test_urls.py
+
+import pytest
+
+from app.urls import canonical_status_id
+
+
+@pytest.mark.parametrize("url", [
+    "https://x.com/a/status/123",
+    "https://x.com/a/status/123?s=20",
+    "twitter.com/a/status/123",
+    "https://mobile.twitter.com/i/web/status/123/photo/1",
+    "https://www.x.com/a/statuses/123",
+    "  https://X.com/a/status/123  ",
+])
+def test_post_urls_give_their_status_id(url):
+    assert canonical_status_id(url) == "123"
+
+
+@pytest.mark.parametrize("url", [
+    "https://x.com/home",
+    "https://x.com/a/status/",
+    "https://example.com/a/status/123",
+    "https://notx.com/a/status/123",
+    "",
+])
+def test_other_urls_give_none(url):
+    assert canonical_status_id(url) is None